@@ -32,47 +32,196 @@ bl_info = {
 ADDON_ID = __package__  # Expected to be: 'bl_ext.blender_org.push_to_talk'
 ADDON_SHORTNAME = "push_to_talk"
 
+import asyncio
+import collections
 import datetime
+import hashlib
+import itertools
 import json
 import logging
+import math
+import mmap
 import os
 import pathlib
 import platform
+import queue
 import re
 import shlex
 import shutil
 import stat
+import tempfile
+import threading
 import time
 import zipfile
 
+from concurrent.futures import ThreadPoolExecutor
 from string import whitespace
 from subprocess import Popen, PIPE, TimeoutExpired
 
 import bpy
-from bpy.props import StringProperty, EnumProperty
+import bpy.utils.previews
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
 from bpy.types import Operator, Panel, AddonPreferences
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 log = logging.getLogger(ADDON_SHORTNAME)
 
+# Instrumentation: callables that receive performance measurements, in seconds, as
+# hook(name, duration, **details). Meant for benchmarks and debugging, e.g.:
+# perf_hooks.append(lambda name, duration, **details: print(name, duration, details))
+perf_hooks = []
+
+
+def report_perf(name, duration, **details):
+    for hook in perf_hooks:
+        hook(name, duration, **details)
+
+
+def call_measured(name, function, *args):
+    """Call function(*args) and report its duration, if there are hooks. For hot paths."""
+
+    if not perf_hooks:
+        return function(*args)
+    time_start = time.perf_counter()
+    result = function(*args)
+    report_perf(name, time.perf_counter() - time_start)
+    return result
+
+
 os_platform = platform.system()  # 'Linux', 'Darwin', 'Java', 'Windows'
 supported_platforms = {'Linux', 'Darwin', 'Windows'}
 
 addon_dir = pathlib.Path(__file__).parent.resolve()
 atunc_exe_path = addon_dir / "atunc" / "atunc"
-ffmpeg_exe_path = shutil.which("ffmpeg")
+# Locations of the tools to list devices and record, see locate_tools().
+ffmpeg_exe_path = None
+arecord_exe_path = None
 
 NO_DEVICE = ("no device found", "no audio device found", "Could not find a connected microphone")
 
 
 # Audio Device Configuration #######################################################################
 
+# Where the Linux kernel lists the ALSA sound cards and their PCMs, and has their device nodes.
+ALSA_CARDS_PATH = "/proc/asound/cards"
+ALSA_PCM_PATH = "/proc/asound/pcm"
+ALSA_DEVICES_DIR = "/dev/snd"
+# ALSA configuration files and directories of them, where sound servers define their PCMs.
+ALSA_CONFIG_PATHS = (
+    "/etc/asound.conf",
+    "~/.asoundrc",
+    "/etc/alsa/conf.d",
+    "/usr/share/alsa/alsa.conf.d",
+)
+
 
 def get_audio_devices_list_linux():
-    """Get list of audio devices on Linux."""
+    """Get list of audio devices on Linux.
+
+    The capture devices are read from the kernel's listings, which takes microseconds instead of
+    running arecord. arecord is only used when those can't be read, e.g. in a sandbox.
+    """
+
+    sound_cards = get_alsa_capture_devices()
+    if sound_cards is None:
+        sound_cards = get_audio_devices_list_arecord()
+    return sound_cards
+
+
+def get_alsa_capture_devices():
+    """List the ALSA capture devices from /proc/asound and /dev/snd.
+
+    The 'default' PCM comes first, then the 'pipewire' one if the ALSA configuration has it:
+    with a sound server, which holds the hardware PCMs, those are the ones that can record.
+    Of the cards, only PCMs with a capture stream, and a capture device node if the nodes can
+    be listed, are kept: no outputs are taken for inputs. They are named like arecord -L does,
+    as the card's 'sysdefault' PCM for its first device, or 'plughw' for others, which convert
+    the format to what ffmpeg asks for.
+    Return None if the kernel's listings can't be read.
+    """
+
+    try:
+        with open(ALSA_CARDS_PATH, encoding="utf-8", errors="replace") as f:
+            cards_text = f.read()
+        with open(ALSA_PCM_PATH, encoding="utf-8", errors="replace") as f:
+            pcm_text = f.read()
+    except OSError:
+        return None
+    try:
+        device_nodes = set(os.listdir(ALSA_DEVICES_DIR))
+    except OSError:
+        device_nodes = None
+
+    # Example /proc/asound/cards, with a second line per card that is skipped:
+    #  1 [U0x46d0x825    ]: USB-Audio - USB Device 0x46d:0x825
+    #                       USB Device 0x46d:0x825 at usb-0000:00:14.0-1, high speed
+    cards = {}  # Card number: (ID, name).
+    for match in re.finditer(r"^ *(\d+) \[(\S+) *\]: .*? - (.*)$", cards_text, re.MULTILINE):
+        cards[int(match[1])] = (match[2], match[3].strip())
+
+    sound_cards = [("default", "Default", "default    Default ALSA device")]
+    if has_alsa_pipewire_pcm():
+        sound_cards.append(("pipewire", "PipeWire", "pipewire    PipeWire Sound Server"))
+
+    # Example /proc/asound/pcm, with the card and device numbers, ID, name and streams:
+    # 00-00: ALC269VC Analog : ALC269VC Analog : playback 1 : capture 1
+    # 00-03: HDMI 0 : HDMI 0 : playback 1
+    for line in pcm_text.splitlines():
+        match = re.match(r"(\d+)-(\d+): (.*)$", line)
+        if not match:
+            continue
+        card_nr, device_nr = int(match[1]), int(match[2])
+        fields = [field.strip() for field in match[3].split(" : ")]
+        if card_nr not in cards or not any(field.startswith("capture") for field in fields):
+            continue
+        if device_nodes is not None and f"pcmC{card_nr}D{device_nr}c" not in device_nodes:
+            continue
+
+        card_id, card_name = cards[card_nr]
+        pcm_name = fields[1] if len(fields) > 1 else fields[0]
+        if device_nr == 0:
+            pcm_id = f"sysdefault:CARD={card_id}"
+            desc = f"{pcm_id}    Default Audio Device"
+        else:
+            pcm_id = f"plughw:CARD={card_id},DEV={device_nr}"
+            desc = f"{pcm_id}    Hardware device with all software conversions"
+        sound_cards.append((pcm_id, f"{card_name}, {pcm_name}", desc))
+    return sound_cards
+
+
+def has_alsa_pipewire_pcm():
+    """Whether the ALSA configuration defines the 'pipewire' PCM, as PipeWire's ALSA plugin does."""
+
+    config_filepaths = []
+    for path in ALSA_CONFIG_PATHS:
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            config_filepaths.extend(
+                os.path.join(path, filename) for filename in sorted(os.listdir(path))
+                if filename.endswith(".conf")
+            )
+        else:
+            config_filepaths.append(path)
+
+    for filepath in config_filepaths:
+        try:
+            with open(filepath, encoding="utf-8", errors="replace") as f:
+                if re.search(r"^\s*pcm\.pipewire\b", f.read(), re.MULTILINE):
+                    return True
+        except OSError:
+            continue  # Not there, or a broken link like in conf.d.
+    return False
+
+
+def get_audio_devices_list_arecord():
+    """Get list of audio devices on Linux, from the PCMs arecord lists."""
 
     # Get named devices using ALSA and arecord.
-    arecord_exe_path = shutil.which("arecord")
     if not arecord_exe_path:
         return []
 
@@ -229,23 +378,11 @@ def get_audio_devices_list_windows():
     return sound_cards
 
 
-def populate_enum_items_for_sound_devices(self, context):
-    """Query the system for available audio devices and populate enum items."""
-
-    # Re-use the existing enum values if they weren't generated too long ago.
-    # Note: this generate function is called often, on draw of the UI element
-    # that renders the enum property and per each enum item when the dropdown
-    # is expanded.
-    # To avoid bogging down the UI render pass, we avoid calling this function
-    # too often, but we still want to call it occasionally, in case the user
-    # plugs in a new audio device while Blender is running.
-    try:
-        last_executed = populate_enum_items_for_sound_devices.last_executed
-        if (time.time() - last_executed) < 5:  # seconds
-            return populate_enum_items_for_sound_devices.enum_items
-    except AttributeError:
-        # First time that the enum is being generated.
-        pass
+def scan_audio_devices():
+    """Query the system for available audio devices.
+
+    This can be slow: it may spawn a process to list the devices. Don't call it from the UI.
+    """
 
     log.debug("Polling system sound cards to update audio input drop-down")
 
@@ -261,12 +398,331 @@ def populate_enum_items_for_sound_devices(self, context):
     if not sound_cards:
         sound_cards = [NO_DEVICE]
 
-    # Update the cached enum items and the generation timestamp
-    populate_enum_items_for_sound_devices.enum_items = sound_cards
-    populate_enum_items_for_sound_devices.last_executed = time.time()
+    log.debug(f"Scanned & found sound devices: {sound_cards}")
+    return sound_cards
+
+
+def get_audio_hardware_signature():
+    """Cheap fingerprint of the connected sound hardware, to know when to scan for devices again.
+
+    Returns None when there is no cheap way to tell on this platform.
+    """
+
+    if os_platform != 'Linux':
+        return None
+
+    # The kernel lists the sound cards in /proc/asound/cards and (un)plugging a device
+    # adds or removes its nodes in /dev/snd. Both are cheap to check, no process needed.
+    try:
+        with open(ALSA_CARDS_PATH, "rb") as f:
+            cards = f.read()
+    except OSError:
+        cards = b""
+    try:
+        dev_snd_mtime = os.stat(ALSA_DEVICES_DIR).st_mtime_ns
+    except OSError:
+        dev_snd_mtime = 0
+    return f"{hashlib.sha1(cards).hexdigest()}:{dev_snd_mtime}"
+
+
+def locate_tools(cache=None):
+    """Find the ffmpeg and arecord executables.
+
+    Searching the PATH can be slow, so trust the locations in the cache, if given, as long as
+    the executables are still there, unchanged. Search the PATH for the others.
+    """
+
+    global ffmpeg_exe_path, arecord_exe_path
+
+    cached_tools = cache.get('tools', {}) if cache else {}
+    tools = {}
+    for tool_name in ("ffmpeg", "arecord"):
+        if tool_name == "arecord" and os_platform != 'Linux':
+            continue
+        cached_path, cached_mtime = cached_tools.get(tool_name, (None, None))
+        if cached_path and get_file_mtime(cached_path) == cached_mtime:
+            tools[tool_name] = cached_path
+        else:
+            tools[tool_name] = shutil.which(tool_name)
+
+    ffmpeg_changed = tools.get("ffmpeg") != ffmpeg_exe_path
+    ffmpeg_exe_path = tools.get("ffmpeg")
+    arecord_exe_path = tools.get("arecord")
+    # After setting them, in case the problems are checked again right away.
+    if ffmpeg_changed:
+        invalidate_recording_problems()
+
+
+class AudioDeviceWatcher:
+    """Keep an up-to-date list of the audio input devices, discovered on a background thread.
+
+    The UI reads the latest snapshot of the devices without ever waiting on a process.
+    The devices are scanned again when the sound hardware changes (on Linux), or otherwise
+    periodically at a slow rate, in case the user plugs in a new audio device while Blender
+    is running.
+    """
+
+    # How often to check the cheap hardware signature for changes, in seconds.
+    check_interval = 1.0
+    # How often to scan regardless of changes, in seconds.
+    rescan_interval = 30.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._devices = [NO_DEVICE]
+        # Blender requires Python to keep a reference to the strings returned by an enum items
+        # callback while they are in use. Keep the previous list alive while the UI catches up.
+        self._previous_devices = self._devices
+        self._wakeup = threading.Event()
+        self._should_stop = False
+        self._thread = None
+        self._signature = None
+        self._last_scanned = 0.0
+        self.num_scans = 0
+
+    @property
+    def devices(self):
+        """The latest list of devices as EnumProperty items. Cheap to call from draw()."""
+        with self._lock:
+            return self._devices
+
+    def _publish(self, sound_cards):
+        with self._lock:
+            if sound_cards == self._devices:
+                return
+            self._previous_devices = self._devices
+            self._devices = sound_cards
+        invalidate_recording_problems()
+
+    def scan_now(self):
+        """Scan for devices on the calling thread, publish the result and cache it to disk."""
+        self._signature = get_audio_hardware_signature()
+        self._last_scanned = time.monotonic()
+        locate_tools()
+        self._publish(scan_audio_devices())
+        self.num_scans += 1
+        save_device_cache(self.devices, self._signature)
+        return self.devices
+
+    def restore(self, sound_cards, signature):
+        """Publish previously found devices, e.g. from the cache, without scanning."""
+        self._signature = signature
+        self._publish(sound_cards)
+
+    def request_scan(self):
+        """Ask the background thread to scan for devices as soon as possible."""
+        self._last_scanned = 0.0
+        self._wakeup.set()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._should_stop = False
+        self._wakeup.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="push_to_talk_device_watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._should_stop = True
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=3)
+            self._thread = None
+
+    def _run(self):
+        while not self._should_stop:
+            self._wakeup.wait(self.check_interval)
+            self._wakeup.clear()
+            if self._should_stop:
+                break
+
+            signature = get_audio_hardware_signature()
+            is_outdated = (time.monotonic() - self._last_scanned) > self.rescan_interval
+            if signature != self._signature or is_outdated:
+                try:
+                    self.scan_now()
+                except Exception:
+                    # Keep the last known devices, and try again on the next periodic scan.
+                    log.exception("Failed to scan for audio devices")
+                    self._last_scanned = time.monotonic()
+
+
+device_watcher = AudioDeviceWatcher()
+
+
+# Why recording isn't possible, computed once per change of the tools or devices, as
+# (generation, (setup problem, device problem)). See get_recording_problems().
+_recording_problems = (-1, (None, None))
+_recording_problems_generation = 0
+
+
+def invalidate_recording_problems():
+    """Have the recording problems checked again, after the tools or devices changed."""
+
+    global _recording_problems_generation
+    _recording_problems_generation += 1
+
+
+def get_recording_problems():
+    """Why recording isn't possible: (problem with the platform or tools, with the devices).
+
+    Each is a message, or None if there is no problem. Cached until the tools or devices change,
+    so it's cheap to call on every redraw.
+    """
+
+    global _recording_problems
+
+    generation, problems = _recording_problems
+    if generation == _recording_problems_generation:
+        return problems
+
+    # Read the generation first: if it changes meanwhile, this is computed again next time.
+    generation = _recording_problems_generation
+    setup_problem = device_problem = None
+    if os_platform not in supported_platforms:
+        setup_problem = f"Recording on {os_platform} is not supported"
+    elif os_platform in {'Linux', 'Windows'} and not ffmpeg_exe_path:
+        setup_problem = "ffmpeg not found separately installed"
+    if device_watcher.devices == [NO_DEVICE]:
+        device_problem = "no audio device found. Is there a microphone plugged in?"
+    problems = (setup_problem, device_problem)
+    _recording_problems = (generation, problems)
+    return problems
+
+
+# Device Cache #####################################################################################
+
+
+def get_user_config_dir():
+    """Directory to store this add-on's files that should persist between sessions."""
+
+    if ADDON_ID.startswith("bl_ext.") and hasattr(bpy.utils, "extension_path_user"):
+        return pathlib.Path(bpy.utils.extension_path_user(ADDON_ID, path="", create=True))
+    return pathlib.Path(bpy.utils.user_resource('CONFIG', path=ADDON_SHORTNAME, create=True))
+
+
+def get_file_mtime(filepath):
+    try:
+        return os.stat(filepath).st_mtime_ns
+    except OSError:
+        return None
+
+
+# File to store the devices and tools found, set on register.
+device_cache_path = None
+
+
+def load_device_cache():
+    """Get the devices and tools found in a previous session, or None."""
+
+    if not device_cache_path:
+        return None
+    try:
+        with open(device_cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get('platform') != os_platform:
+        return None
+    return cache
+
+
+def save_device_cache(sound_cards, signature):
+    """Store the found devices and tools to start faster next time."""
+
+    if not device_cache_path:
+        return
+    cache = {
+        'platform': os_platform,
+        'signature': signature,
+        'devices': sound_cards,
+        'tools': {
+            tool_name: (tool_path, get_file_mtime(tool_path))
+            for tool_name, tool_path in (("ffmpeg", ffmpeg_exe_path), ("arecord", arecord_exe_path))
+            if tool_path
+        },
+    }
+    try:
+        temp_path = device_cache_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding='utf-8') as f:
+            json.dump(cache, f, indent=1)
+        os.replace(temp_path, device_cache_path)
+    except OSError as err:
+        log.warning(f"PushToTalk: could not save the device cache: {err}")
+
+
+def restore_preferred_audio_device():
+    """Set the runtime audio device to the user's preferred device, if it is connected.
+
+    Return False if there are no known devices yet to choose from.
+    """
+
+    addon_prefs = bpy.context.preferences.addons[ADDON_ID].preferences
+    audio_input_devices = {
+        'Linux': addon_prefs.audio_device_linux,
+        'Darwin': addon_prefs.audio_device_darwin,
+        'Windows': addon_prefs.audio_device_windows,
+    }
+    saved_setting_value = audio_input_devices[os_platform]
+    log.debug(f"Preferred device from user settings: \"{saved_setting_value}\"")
+
+    audio_devices_found = device_watcher.devices
+    assert audio_devices_found  # Should always have an option also when no device is found.
+
+    found_preferred_mic = False
+    for enum_item in audio_devices_found:
+        if enum_item[0] == saved_setting_value:
+            found_preferred_mic = True
+            break
+
+    if found_preferred_mic:
+        # Set the runtime setting to the user setting.
+        if addon_prefs.audio_input_device != saved_setting_value:
+            addon_prefs.audio_input_device = saved_setting_value
+        return True
+
+    if device_watcher.num_scans == 0 and audio_devices_found == [NO_DEVICE]:
+        # Nothing known yet. Don't overwrite the user setting before looking for devices.
+        return False
+
+    # Log if the user setting got lost.
+    if saved_setting_value != "setting not synced yet":
+        log.info(
+            f"Could not restore audio device user preference: "
+            f"'{saved_setting_value}'. This can happen if the preferred audio device "
+            f"is not currently connected."
+        )
+    # Set the runtime setting to the first audio device.
+    # This will also update the user setting via the enum's update function.
+    addon_prefs.audio_input_device = str(audio_devices_found[0][0])
+    return True
+
+
+def revalidate_audio_devices():
+    """Timer callback to look for devices in the background once the UI is up.
 
-    log.debug(f"Scanned & found sound devices: {populate_enum_items_for_sound_devices.enum_items}")
-    return populate_enum_items_for_sound_devices.enum_items
+    The devices restored from the cache at startup may be outdated. Start the device watcher
+    and restore the preferred device once the first scan is done.
+    """
+
+    device_watcher.start()
+    if device_watcher.num_scans == 0:
+        return 0.5  # Check again soon.
+
+    restore_preferred_audio_device()
+    return None
+
+
+def populate_enum_items_for_sound_devices(self, context):
+    """Populate enum items with the last known available audio devices.
+
+    Note: this generate function is called often, on draw of the UI element that renders the
+    enum property, per each enum item when the dropdown is expanded and on every operator poll.
+    The devices are discovered on a background thread so this only returns the latest snapshot.
+    """
+    return device_watcher.devices
 
 
 def save_sound_card_preference(self, context):
@@ -290,143 +746,3068 @@ def save_sound_card_preference(self, context):
         addon_prefs.audio_device_windows = audio_device
 
 
-# Operator #########################################################################################
+# Enum items for the additional audio inputs, kept referenced for Blender. See below.
+_extra_device_items = []
+_extra_device_items_source = None
 
 
-class SEQUENCER_OT_push_to_talk(Operator):
-    bl_idname = "sequencer.push_to_talk"
-    bl_label = "Start Recording"
-    bl_description = "Add a sound strip with audio recorded from the microphone"
-    bl_options = {'UNDO', 'REGISTER'}
+def populate_enum_items_for_extra_sound_devices(self, context):
+    """Populate enum items for the additional audio inputs: the audio devices, or none."""
 
-    # Runtime state shared between instances of this operator
-    should_stop = False
-    is_running = False
-    visual_feedback_strip = None
-    strip_channel = 1
+    global _extra_device_items, _extra_device_items_source
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    devices = device_watcher.devices
+    if devices is not _extra_device_items_source:
+        # Blender doesn't keep the strings of the items: they must outlive this call.
+        _extra_device_items = [('NONE', "None", "Don't record another input")] + list(devices)
+        _extra_device_items_source = devices
+    return _extra_device_items
 
-        self.filepath: str = ""
-        self.recording_process = None
-        self._timer = None
-        self.was_playing = None
-        self.frame_start = None
 
-    def add_visual_feedback_strip(self, context):
-        """Add a color strip to mark the current progress of the recording."""
+# Number of audio inputs that can be recorded at once, see get_audio_input_devices().
+MAX_AUDIO_INPUTS = 4
 
-        scene = context.scene
-        self.frame_start = scene.frame_current
 
-        strip = scene.sequence_editor.sequences.new_effect(
-            name="Recording...",
-            type='COLOR',
-            channel=1,
-            frame_start=self.frame_start,
-            frame_end=self.frame_start + 1,
-        )
-        strip.color = (0.5607842206954956, 0.21560697257518768, 0.1903851181268692)
-        strip.blend_alpha = 0.0
+def get_audio_input_devices(addon_prefs):
+    """The audio devices to record from, as a tuple. Empty if there is no device.
 
-        SEQUENCER_OT_push_to_talk.visual_feedback_strip = strip
+    More than one when recording multiple inputs into parallel strips, which is only
+    supported where capturing with ffmpeg.
+    """
 
-    @classmethod
-    def poll(cls, context):
-        if os_platform not in supported_platforms:
-            cls.poll_message_set(f"recording not supported on {os_platform}")
-            return False
+    if addon_prefs.audio_input_device in {NO_DEVICE[0], ""}:
+        return ()
+    audio_devices = [addon_prefs.audio_input_device]
+    if addon_prefs.use_multiple_inputs and os_platform in {'Linux', 'Windows'}:
+        for nr in range(2, MAX_AUDIO_INPUTS + 1):
+            audio_device = getattr(addon_prefs, f"audio_input_device_{nr}")
+            if audio_device not in {'NONE', NO_DEVICE[0]} and audio_device not in audio_devices:
+                audio_devices.append(audio_device)
+    return tuple(audio_devices)
 
-        if os_platform in {'Linux', 'Windows'} and not ffmpeg_exe_path:
-            cls.poll_message_set("ffmpeg not found separately installed")
-            return False
 
-        addon_prefs = context.preferences.addons[ADDON_ID].preferences
-        if addon_prefs.audio_input_device == NO_DEVICE:
-            cls.poll_message_set("no audio device found. Is there a microphone plugged in?")
-            return False
+# Audio Analysis ###################################################################################
 
-        # This operator is available only in the sequencer area of the sequence editor.
-        return context.space_data.type == 'SEQUENCE_EDITOR' and (
-            context.space_data.view_type == 'SEQUENCER'
-            or context.space_data.view_type == 'SEQUENCER_PREVIEW'
-        )
 
-    def generate_filename(self, context) -> bool:
-        """Check filename availability for the sound file."""
+class PCMRingBuffer:
+    """Fixed-size buffer holding the most recently captured PCM audio.
 
-        addon_prefs = context.preferences.addons[ADDON_ID].preferences
+    The memory is allocated once. Writing copies into it, wrapping around at the end.
+    """
 
-        # Resolve possible paths relative to the blend file to a system path
-        sounds_dir_sys = bpy.path.abspath(addon_prefs.sounds_dir)
-        if not os.path.isdir(sounds_dir_sys):
-            if bpy.path.abspath('//') == '':
-                reason = ".blend file needs to be saved so the sound clips go in the same directory"
+    def __init__(self, size):
+        self.size = size
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.write_pos = 0
+        self.total_written = 0
+
+    def write(self, data):
+        num_bytes = len(data)
+        if num_bytes >= self.size:
+            # Only the tail of the data fits.
+            self.view[:] = data[num_bytes - self.size:]
+            self.write_pos = 0
+        else:
+            first_part = min(num_bytes, self.size - self.write_pos)
+            self.view[self.write_pos:self.write_pos + first_part] = data[:first_part]
+            if first_part < num_bytes:
+                self.view[:num_bytes - first_part] = data[first_part:]
+            self.write_pos = (self.write_pos + num_bytes) % self.size
+        self.total_written += num_bytes
+
+    def latest(self, num_bytes):
+        """Views on the latest bytes, as up to two segments, oldest first. No data is copied."""
+
+        num_bytes = min(num_bytes, self.size, self.total_written)
+        if not num_bytes:
+            return []
+        start = self.write_pos - num_bytes
+        if start >= 0:
+            return [self.view[start:self.write_pos]]
+        if not self.write_pos:
+            return [self.view[self.size + start:]]
+        return [self.view[self.size + start:], self.view[:self.write_pos]]
+
+    def resize(self, size):
+        """Change the size of the buffer, keeping as much of the latest data as fits."""
+
+        latest = self.latest(size)
+        buffer = bytearray(size)
+        num_bytes = 0
+        for segment in latest:
+            buffer[num_bytes:num_bytes + len(segment)] = segment
+            num_bytes += len(segment)
+        self.view.release()
+        self.size = size
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.write_pos = num_bytes % size
+        self.total_written = num_bytes
+
+
+class LevelMeter:
+    """Peak and RMS levels of the captured audio, accumulated until the UI reads them.
+
+    Levels are computed on the capture thread over each block of audio it receives, with
+    NumPy when available. They are normalized to [0, 1], with 1 being full scale.
+    """
+
+    def __init__(self, max_block_samples):
+        self._peak = 0.0
+        self._sum_squares = 0.0
+        self._num_samples = 0
+        if np:
+            # Scratch memory reused for every block, to avoid allocating in the capture loop.
+            self._work = np.empty(max_block_samples, dtype=np.float32)
+
+    def update(self, data):
+        """Accumulate the levels of a block of signed 16-bit PCM samples."""
+
+        if np:
+            samples = np.frombuffer(data, dtype=np.int16)
+            work = self._work[:samples.size]
+            np.multiply(samples, 1.0 / 32768.0, out=work)
+            peak = float(max(work.max(), -work.min())) if samples.size else 0.0
+            sum_squares = float(np.dot(work, work))
+        else:
+            samples = data.cast('h')
+            peak = max(max(samples), -min(samples)) / 32768.0 if len(samples) else 0.0
+            sum_squares = sum(s * s for s in samples) / (32768.0 * 32768.0)
+
+        # Note: the UI thread may reset these concurrently. Losing a block's levels for the
+        # display is harmless, so don't pay for a lock.
+        self._peak = max(self._peak, peak)
+        self._sum_squares += sum_squares
+        self._num_samples += len(samples)
+
+    def read(self):
+        """Get the (peak, rms) levels since the last read, and start accumulating anew."""
+
+        peak, sum_squares, num_samples = self._peak, self._sum_squares, self._num_samples
+        self._peak, self._sum_squares, self._num_samples = 0.0, 0.0, 0
+        rms = math.sqrt(sum_squares / num_samples) if num_samples else 0.0
+        return peak, rms
+
+
+def level_to_db(level):
+    """Convert a linear level in [0, 1] to dBFS, clamped to -100 dB for silence."""
+    return 20 * math.log10(level) if level > 1e-5 else -100.0
+
+
+def read_wav_info(filepath):
+    """Read the format of a PCM WAV file and where its audio data is.
+
+    Return a dict with: sample_rate, num_channels, sample_width, format_tag, data_offset and
+    data_size. The data size is taken from the file size if the header wasn't finalized.
+    Raise ValueError if the file is not a WAV file.
+    """
+
+    with open(filepath, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"not a WAV file: '{filepath}'")
+
+        info = {}
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"no audio data in WAV file: '{filepath}'")
+            chunk_id = chunk_header[:4]
+            chunk_size = int.from_bytes(chunk_header[4:], 'little')
+
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                info['format_tag'] = int.from_bytes(fmt[0:2], 'little')
+                info['num_channels'] = int.from_bytes(fmt[2:4], 'little')
+                info['sample_rate'] = int.from_bytes(fmt[4:8], 'little')
+                info['sample_width'] = int.from_bytes(fmt[14:16], 'little') // 8
+                if info['format_tag'] == 0xFFFE and len(fmt) >= 26:  # WAVE_FORMAT_EXTENSIBLE
+                    info['format_tag'] = int.from_bytes(fmt[24:26], 'little')
+                # Chunks are padded to an even size.
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if 'format_tag' not in info:
+                    raise ValueError(f"no format in WAV file: '{filepath}'")
+                info['data_offset'] = f.tell()
+                available = os.fstat(f.fileno()).st_size - info['data_offset']
+                # The size is 0 or bogus if the recording was not finished properly.
+                if chunk_size == 0 or chunk_size > available:
+                    chunk_size = available
+                frame_size = info['num_channels'] * info['sample_width']
+                info['data_size'] = chunk_size - chunk_size % frame_size
+                return info
             else:
-                reason = f"directory to save the sound clips does not exist: '{sounds_dir_sys}'"
-            self.report({'ERROR'}, f"Could not record audio: {reason}")
-            return False
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
 
-        if not os.access(sounds_dir_sys, os.W_OK):
-            self.report(
-                {'ERROR'},
-                "Could not record audio: the directory to save the sound clips is not writable",
-            )
-            return False
 
-        timestamp = datetime.datetime.now().strftime("_%Y-%m-%d_%H-%M-%S")
+# Format to decode non-WAV sound files to, for analysis.
+DECODE_PCM_FORMAT = {'format_tag': 1, 'sample_rate': 48000, 'num_channels': 2, 'sample_width': 2}
 
-        self.filepath = f"{sounds_dir_sys}{addon_prefs.prefix}{timestamp}.wav"
 
-        if os.path.exists(self.filepath):
-            self.report(
-                {'ERROR'},
-                f"Could not record audio: "
-                f"a file already exists where the sound clip would be saved: {self.filepath}"
-            )
-            return False
+def get_pcm_format(filepath):
+    """Get the format of the 16-bit PCM audio that iter_pcm_slabs() gives for a sound file."""
 
-        return True
+    if os.path.splitext(filepath)[1].lower() != ".wav":
+        if not ffmpeg_exe_path:
+            raise ValueError(f"ffmpeg is needed to decode '{filepath}'")
+        return dict(DECODE_PCM_FORMAT, data_offset=None, data_size=None)
 
-    def start_recording(self, context) -> bool:
-        """Start a process to record audio."""
+    info = read_wav_info(filepath)
+    if info['format_tag'] != 1 or info['sample_width'] != 2:
+        raise ValueError(f"unsupported WAV format for analysis: '{filepath}'")
+    return info
 
-        addon_prefs = context.preferences.addons[ADDON_ID].preferences
-        audio_device = addon_prefs.audio_input_device
 
-        if os_platform == 'Darwin':
-            args = [atunc_exe_path, "--device-id", audio_device, "--output-path", self.filepath]
-            self.recording_process = Popen(args)
+def iter_pcm_slabs(filepath, pcm_format, slab_size):
+    """Iterate over the audio of a sound file in slabs of slab_size bytes, or less at the end.
+
+    WAV files are memory mapped and other formats decoded by ffmpeg through a pipe, so that
+    long takes don't need to be loaded in memory. Each slab is a view that is only valid
+    until the next one is requested.
+    """
+
+    if pcm_format['data_offset'] is not None:
+        with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data_offset = pcm_format['data_offset']
+            data = memoryview(mm)[data_offset:data_offset + pcm_format['data_size']]
+            try:
+                for slab_start in range(0, len(data), slab_size):
+                    slab = data[slab_start:slab_start + slab_size]
+                    yield slab
+                    slab.release()
+            finally:
+                data.release()
+        return
+
+    args = [
+        ffmpeg_exe_path, "-hide_banner", "-loglevel", "error", "-nostdin", "-i", filepath,
+        "-vn", "-ar", str(pcm_format['sample_rate']), "-ac", str(pcm_format['num_channels']),
+        "-f", "s16le", "pipe:1",
+    ]
+    buffer = bytearray(slab_size)
+    view = memoryview(buffer)
+    with Popen(args, stdout=PIPE) as proc:
+        num_bytes = 0
+        while True:
+            num_read = proc.stdout.readinto(view[num_bytes:])
+            num_bytes += num_read
+            if num_bytes == slab_size or (not num_read and num_bytes):
+                yield view[:num_bytes]
+                num_bytes = 0
+            if not num_read:
+                break
+
+
+def find_audible_range(filepath, threshold, block_duration=0.01):
+    """Find where the audio in a sound file is louder than a threshold.
+
+    The energy (RMS) is measured over blocks of block_duration seconds, processed in slabs
+    of many blocks at a time.
+    Return (start, end) in seconds, or None if the whole file is below the threshold.
+    """
+
+    pcm_format = get_pcm_format(filepath)
+    num_frames_per_block = max(1, int(pcm_format['sample_rate'] * block_duration))
+    block_duration = num_frames_per_block / pcm_format['sample_rate']
+    block_samples = num_frames_per_block * pcm_format['num_channels']
+    block_size = block_samples * 2
+
+    # Compare sums of squares of whole blocks, to avoid a sqrt per block.
+    threshold_sum_squares = (threshold * 32768.0) ** 2 * block_samples
+    slab_blocks = 1000  # Blocks processed at a time.
+    first_loud = last_loud = None
+    slab_start = 0  # Index of the first block in the slab.
+
+    for slab in iter_pcm_slabs(filepath, pcm_format, slab_blocks * block_size):
+        num_blocks = len(slab) // block_size
+        if np:
+            samples = np.frombuffer(slab, dtype=np.int16, count=num_blocks * block_samples)
+            blocks = samples.astype(np.float32).reshape(num_blocks, block_samples)
+            del samples
+            sum_squares = np.einsum('ij,ij->i', blocks, blocks)
+            loud = np.flatnonzero(sum_squares > threshold_sum_squares)
+            loud_blocks = (loud[0], loud[-1]) if loud.size else None
+        else:
+            samples = slab[:num_blocks * block_size].cast('h')
+            loud = [
+                i for i in range(num_blocks)
+                if sum(s * s for s in samples[i * block_samples:(i + 1) * block_samples])
+                > threshold_sum_squares
+            ]
+            loud_blocks = (loud[0], loud[-1]) if loud else None
+            samples.release()
+
+        if loud_blocks:
+            if first_loud is None:
+                first_loud = slab_start + int(loud_blocks[0])
+            last_loud = slab_start + int(loud_blocks[1])
+        slab_start += num_blocks
+
+    if first_loud is None:
+        return None
+    return first_loud * block_duration, (last_loud + 1) * block_duration
+
+
+def get_block_peaks(slab, block_samples):
+    """Peak sample values of each block of block_samples of a slab of 16-bit PCM, with NumPy.
+
+    The last block may be partial. No views on the slab are kept, so it can be released.
+    """
+
+    samples = np.frombuffer(slab, dtype=np.int16, count=len(slab) // 2)
+    num_whole = samples.size - samples.size % block_samples
+    blocks = samples[:num_whole].reshape(-1, block_samples)
+    # Only the peaks are converted, to negate -32768 without overflowing.
+    peaks = np.maximum(blocks.max(axis=1), -blocks.min(axis=1).astype(np.int32))
+    if num_whole < samples.size:
+        tail = samples[num_whole:]
+        peaks = np.append(peaks, max(int(tail.max()), -int(tail.min())))
+    return peaks
+
+
+def compute_waveform_peaks(filepath, num_bins, block_duration=0.01):
+    """Find the peak level of the audio in num_bins equal parts of a sound file.
+
+    Peaks are found per block of block_duration seconds, processed in slabs of many blocks at
+    a time, then the blocks are grouped into the bins.
+    Return a list of num_bins levels in [0, 1].
+    """
+
+    pcm_format = get_pcm_format(filepath)
+    block_samples = max(1, int(pcm_format['sample_rate'] * block_duration))
+    block_samples *= pcm_format['num_channels']
+    block_size = block_samples * 2
+    slab_blocks = 1000  # Blocks processed at a time.
 
+    block_peaks = []
+    for slab in iter_pcm_slabs(filepath, pcm_format, slab_blocks * block_size):
+        if np:
+            block_peaks.append(get_block_peaks(slab, block_samples))
         else:
-            # On Windows and Linux
+            samples = slab[:len(slab) // 2 * 2].cast('h')
+            block_peaks.extend(
+                max(max(samples[i:i + block_samples]), -min(samples[i:i + block_samples]))
+                for i in range(0, len(samples), block_samples)
+            )
+            samples.release()
+
+    if np:
+        block_peaks = np.concatenate(block_peaks) if block_peaks else np.zeros(0, np.int32)
+        if not block_peaks.size:
+            return [0.0] * num_bins
+        edges = np.arange(num_bins) * block_peaks.size // num_bins
+        return (np.maximum.reduceat(block_peaks, edges) / 32768.0).tolist()
+
+    if not block_peaks:
+        return [0.0] * num_bins
+    peaks = []
+    for i in range(num_bins):
+        start = i * len(block_peaks) // num_bins
+        end = max((i + 1) * len(block_peaks) // num_bins, start + 1)
+        peaks.append(max(block_peaks[start:end]) / 32768.0)
+    return peaks
+
+
+def get_k_weighting_response(sample_rate, num_frames):
+    """Power response of the K-weighting filter of ITU-R BS.1770, at the bins of an rfft.
+
+    The filter's two biquads are evaluated at the bin frequencies instead of being run over
+    the samples, which would need a loop per sample in Python.
+    """
 
-            # At this point ffmpeg should exist as the operator poll() would have failed.
-            assert ffmpeg_exe_path and os_platform in supported_platforms
+    # Coefficients for any sample rate, as derived in libebur128.
+    k = math.tan(math.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = [
+        (vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0
+    ]
+    shelf_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    k = math.tan(math.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    highpass_b = [1.0, -2.0, 1.0]
+    highpass_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    z = np.exp(-1j * 2 * np.pi * np.fft.rfftfreq(num_frames))
+    response = np.ones(z.size)
+    for b, a in ((shelf_b, shelf_a), (highpass_b, highpass_a)):
+        response *= np.abs(np.polyval(b[::-1], z) / np.polyval(a[::-1], z)) ** 2
+    return response
+
+
+def get_true_peak_filters(oversampling=4, taps_per_phase=12):
+    """Polyphase windowed-sinc filters to interpolate a signal, to find its true peak."""
+
+    num_taps = oversampling * taps_per_phase
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    kernel = np.sinc(n / oversampling) * np.kaiser(num_taps, 5.0)
+    filters = kernel.reshape(taps_per_phase, oversampling).T.copy()
+    filters /= filters.sum(axis=1, keepdims=True)  # Unity gain for every phase.
+    return filters
+
+
+class LoudnessMeter:
+    """Integrated loudness and true peak of a stream of audio, measured as it comes in.
+
+    Follows EBU R128 / ITU-R BS.1770: loudness is measured over 400ms blocks overlapping by
+    75% and gated, and the true peak found on the signal oversampled 4 times. The audio is
+    processed in steps of 100ms, so nothing needs to be read again once the stream ends.
+    Needs NumPy.
+    """
 
-            # Set platform dependent arguments.
-            if os_platform == 'Linux':
-                ffmpeg_command = f'-f alsa -i "{audio_device}"'
-            else:  # 'Windows'
-                ffmpeg_command = f'-f dshow -i audio="{audio_device}"'
+    step_duration = 0.1  # Seconds.
+    steps_per_block = 4
+    absolute_gate = -70.0  # LUFS.
+    relative_gate = -10.0  # LU, relative to the loudness of the blocks above the absolute gate.
+
+    def __init__(self, sample_rate, num_channels):
+        self.num_channels = num_channels
+        self.step_frames = int(sample_rate * self.step_duration)
+        self.step_size = self.step_frames * num_channels * 2  # 16-bit samples.
+
+        # Mean squares of K-weighted audio are computed from the spectrum of each step, with
+        # the factors of Parseval's theorem for a real FFT: non-edge bins count twice.
+        weights = get_k_weighting_response(sample_rate, self.step_frames)
+        weights[1:(self.step_frames + 1) // 2] *= 2
+        self._spectrum_weights = weights / (self.step_frames * self.step_frames)
+        self._peak_filters = get_true_peak_filters()
+        self._history_frames = self._peak_filters.shape[1] - 1
+
+        # Audio of the step in progress, plus the end of the previous one for interpolation.
+        self._pending = bytearray(self.step_size)
+        self._num_pending = 0
+        self._samples = np.zeros(
+            (self._history_frames + self.step_frames, num_channels), dtype=np.float32
+        )
+        self._step_powers = []
+        self.block_powers = []  # Mean square of K-weighted audio per 400ms block.
+        self.true_peak = 0.0  # Linear, 1 is full scale.
+
+    def update(self, data):
+        """Measure a block of signed 16-bit PCM samples, of any length of whole frames."""
+
+        view = memoryview(data).cast('B')
+        while view:
+            num_bytes = min(len(view), self.step_size - self._num_pending)
+            self._pending[self._num_pending:self._num_pending + num_bytes] = view[:num_bytes]
+            self._num_pending += num_bytes
+            view = view[num_bytes:]
+            if self._num_pending == self.step_size:
+                self._measure_step()
+                self._num_pending = 0
+
+    def _measure_step(self):
+        samples = self._samples
+        samples[:self._history_frames] = samples[-self._history_frames:]
+        new_samples = samples[self._history_frames:]
+        np.multiply(
+            np.frombuffer(self._pending, dtype=np.int16).reshape(-1, self.num_channels),
+            1.0 / 32768.0,
+            out=new_samples,
+        )
+
+        spectrum = np.fft.rfft(new_samples, axis=0)
+        bin_powers = spectrum.real ** 2 + spectrum.imag ** 2
+        # Channels are weighted equally: there are no surround channels in a recording.
+        self._step_powers.append(float(np.sum(self._spectrum_weights @ bin_powers)))
+        if len(self._step_powers) >= self.steps_per_block:
+            block_steps = self._step_powers[-self.steps_per_block:]
+            self.block_powers.append(sum(block_steps) / self.steps_per_block)
+            del self._step_powers[:-self.steps_per_block]
+
+        for channel in samples.T:
+            for phase_filter in self._peak_filters:
+                interpolated = np.convolve(channel, phase_filter, mode='valid')
+                self.true_peak = max(
+                    self.true_peak, float(max(interpolated.max(), -interpolated.min()))
+                )
+
+    @property
+    def integrated_loudness(self):
+        """Gated loudness of the audio so far, in LUFS, or None if it's all silent or short."""
+
+        powers = np.array(self.block_powers)
+        powers = powers[powers > 10 ** ((self.absolute_gate + 0.691) / 10)]
+        if not powers.size:
+            return None
+        relative_threshold = float(np.mean(powers)) * 10 ** (self.relative_gate / 10)
+        powers = powers[powers > relative_threshold]
+        return -0.691 + 10 * math.log10(float(np.mean(powers)))
+
+    @property
+    def true_peak_db(self):
+        """Maximum true peak of the audio so far, in dBTP."""
+        return level_to_db(self.true_peak)
+
+
+def measure_loudness(filepath):
+    """Measure the integrated loudness and true peak of a sound file, see LoudnessMeter."""
+
+    pcm_format = get_pcm_format(filepath)
+    meter = LoudnessMeter(pcm_format['sample_rate'], pcm_format['num_channels'])
+    for slab in iter_pcm_slabs(filepath, pcm_format, 256 * meter.step_size):
+        meter.update(slab)
+    return meter.integrated_loudness, meter.true_peak_db
+
+
+def get_normalized_volume(loudness, true_peak, target, peak_limit):
+    """Volume for a sound to play at the target loudness without peaking over the limit.
+
+    Loudness and target are in LUFS, true peak and limit in dBTP. Return None if the sound
+    was silent.
+    """
+
+    if loudness is None:
+        return None
+    gain = min(target - loudness, peak_limit - true_peak)
+    return min(max(10 ** (gain / 20), 0.0), 100.0)  # The range of a sound strip's volume.
+
+
+# Audio Capture ####################################################################################
+
+# Format of the audio streamed from ffmpeg, unless the preferences ask otherwise, see
+# get_capture_format(). Most microphones are mono, stereo would only double the files' size.
+CAPTURE_SAMPLE_RATE = 48000
+CAPTURE_CHANNELS = 1
+CAPTURE_SAMPLE_WIDTH = 2  # Bytes per sample: signed 16-bit little endian PCM.
+# Seconds of the latest captured audio kept in memory at least, more if needed for pre-roll.
+CAPTURE_RING_BUFFER_DURATION = 1.0
+# Peak level under which the input is considered silent (-60 dBFS).
+SILENCE_LEVEL = 0.001
+
+# ffmpeg log messages about audio lost by the device: ALSA xruns, dshow buffer overflows.
+OVERRUN_PATTERN = re.compile(r"xrun|overrun|underrun|too full|frame dropped", re.IGNORECASE)
+# Keys of ffmpeg's -progress output, to tell them apart from log messages.
+PROGRESS_KEYS = frozenset((
+    'frame', 'fps', 'bitrate', 'total_size', 'out_time_us', 'out_time_ms', 'out_time',
+    'dup_frames', 'drop_frames', 'speed', 'progress',
+))
+# Audio missing from a take, by the system clock, above which to warn, in seconds. It grows by
+# 0.1% of the take's duration, since the audio device's clock drifts a little from it.
+MISSING_AUDIO_TOLERANCE = 0.1
+# Seconds without audio from ffmpeg after which capture is considered stalled.
+CAPTURE_STALL_TIMEOUT = 0.5
+
+
+# Bytes of audio to gather in memory before writing them to disk, by default.
+WRITE_BUFFER_SIZE = 256 * 1024
+# Seconds of audio after which a file being recorded is synced to disk, by default.
+SYNC_INTERVAL = 2.0
+# Longest sync interval that can be set. Well under ORPHANED_RECORDING_AGE, for takes in
+# progress to never be taken for orphaned ones and repaired, whatever the write buffer size.
+MAX_SYNC_INTERVAL = 30.0
+
+
+class WavWriter:
+    """Write PCM audio to a WAV file, with the header sizes filled in on close.
+
+    Audio is written to disk in chunks of buffer_size bytes, to avoid many small writes on
+    network drives. Every sync_interval seconds of audio, the buffer is flushed and the
+    header updated, so that the file is valid up to then if Blender crashes.
+    """
+
+    header_size = 44
+
+    def __init__(
+        self,
+        filepath,
+        sample_rate,
+        num_channels,
+        sample_width,
+        buffer_size=WRITE_BUFFER_SIZE,
+        sync_interval=SYNC_INTERVAL,
+    ):
+        self.filepath = filepath
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.sample_width = sample_width
+        self.data_size = 0
+        frame_size = num_channels * sample_width
+        self.sync_size = max(int(sync_interval * sample_rate), 1) * frame_size
+        self._next_sync = self.sync_size
+        add_recording_marker(filepath)
+        # Note: with no buffer, every write goes straight to the OS.
+        self.file = open(filepath, "wb", buffering=buffer_size)
+        self.file.write(self._header())
+
+    def _header(self):
+        block_align = self.num_channels * self.sample_width
+        return b"".join((
+            b"RIFF",
+            (36 + self.data_size).to_bytes(4, 'little'),
+            b"WAVE",
+            b"fmt ",
+            (16).to_bytes(4, 'little'),
+            (1).to_bytes(2, 'little'),  # PCM
+            self.num_channels.to_bytes(2, 'little'),
+            self.sample_rate.to_bytes(4, 'little'),
+            (self.sample_rate * block_align).to_bytes(4, 'little'),
+            block_align.to_bytes(2, 'little'),
+            (self.sample_width * 8).to_bytes(2, 'little'),
+            b"data",
+            self.data_size.to_bytes(4, 'little'),
+        ))
+
+    def write(self, data):
+        self.file.write(data)
+        self.data_size += len(data)
+        if self.data_size >= self._next_sync:
+            self.sync()
+
+    def sync(self):
+        """Write out the buffered audio and update the header with the current size."""
+
+        self.file.seek(0)  # Flushes the buffer.
+        self.file.write(self._header())
+        self.file.seek(0, os.SEEK_END)
+        self.file.flush()
+        self._next_sync = self.data_size + self.sync_size
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(self._header())
+        self.file.close()
+        remove_recording_marker(self.filepath)
+
+
+# Blocks of audio queued for an encoder that is slow to take them, e.g. writing to a stalled
+# network drive, before writing waits too. Each is a read of the capture, a few ms of audio.
+ENCODER_QUEUE_SIZE = 2048
+
+
+class EncoderWriter:
+    """Encode PCM audio to a compressed sound file as it is written, with an ffmpeg process.
+
+    Without a buffer, ffmpeg writes each encoded packet out as soon as it is ready, so that
+    the file holds everything up to the last packet if Blender or ffmpeg crash. Otherwise,
+    the audio is handed to ffmpeg every sync_interval seconds, or when the buffer is full,
+    and ffmpeg writes the file in chunks of its own.
+
+    The audio is queued and fed to ffmpeg on a thread of its own, so that writing returns at
+    once even when ffmpeg is slow to take it. The capture session writes under its lock.
+    """
+
+    def __init__(
+        self,
+        filepath,
+        sample_rate,
+        num_channels,
+        sample_width,
+        codec_args,
+        buffer_size=WRITE_BUFFER_SIZE,
+        sync_interval=SYNC_INTERVAL,
+    ):
+        assert sample_width == 2
+        self.filepath = filepath
+        self.data_size = 0
+        self.sync_size = max(int(sync_interval * sample_rate), 1) * num_channels * sample_width
+        self._next_sync = self.sync_size
+        self.args = [
+            ffmpeg_exe_path, "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", str(num_channels), "-i", "pipe:0",
+            *codec_args,
+            "-flush_packets", "0" if buffer_size else "1",
+            "-n",  # Never overwrite an existing file.
+            filepath,
+        ]
+        add_recording_marker(filepath)
+        self.process = Popen(self.args, stdin=PIPE, bufsize=buffer_size)
+        log.debug(f"PushToTalk: {self.args}")
+
+        # Blocks of audio to feed to ffmpeg, an empty one to flush its pipe, None to stop.
+        self._queue = queue.Queue(maxsize=ENCODER_QUEUE_SIZE)
+        self._failed = False
+        self._feeder = threading.Thread(
+            target=self._feed_loop, name="push_to_talk_encoder", daemon=True
+        )
+        self._feeder.start()
+
+    def write(self, data):
+        if self._failed:
+            return
+        self._queue.put(bytes(data))  # A copy, the caller reuses its buffer.
+        self.data_size += len(data)
+        if self.data_size >= self._next_sync:
+            self.sync()
+
+    def sync(self):
+        """Hand the buffered audio to ffmpeg, once what was written before is fed to it."""
+
+        if not self._failed:
+            self._queue.put(b"")
+        self._next_sync = self.data_size + self.sync_size
+
+    def _feed_loop(self):
+        stdin = self.process.stdin
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            if self._failed:
+                continue  # Keep emptying the queue, for writers not to wait on it.
+            try:
+                if data:
+                    stdin.write(data)
+                else:
+                    stdin.flush()
+            except OSError:
+                if not self._failed:  # Unless it was killed, see close().
+                    log.error(f"PushToTalk: the encoder for '{self.filepath}' stopped unexpectedly")
+                self._failed = True
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+    def close(self, timeout=10):
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(None, timeout=timeout)
+            self._feeder.join(max(deadline - time.monotonic(), 0.0))
+            if self._feeder.is_alive():
+                raise TimeoutExpired(self.args, timeout)
+            self.process.wait(max(deadline - time.monotonic(), 0.0))
+        except (queue.Full, TimeoutExpired):
+            log.warning(f"Encoder did not finish '{self.filepath}' within {timeout} seconds.")
+            self._failed = True
+            self.process.kill()
+            self.process.wait()
+            # The feeder's write fails now, then it empties the queue, up to this.
+            self._queue.put(None)
+            return  # Leave the file to be repaired, see recover_recordings().
+        remove_recording_marker(self.filepath)
+
+
+# Sound file formats to save recordings in, and their file extension.
+FILE_FORMATS = {
+    'WAV': ".wav",
+    'FLAC': ".flac",
+    'OPUS': ".ogg",
+}
+
+
+def get_codec_args(addon_prefs):
+    """ffmpeg arguments to encode the chosen file format, empty for uncompressed WAV."""
+
+    if addon_prefs.file_format == 'FLAC':
+        return ["-c:a", "flac", "-compression_level", str(addon_prefs.flac_compression)]
+    if addon_prefs.file_format == 'OPUS':
+        return ["-c:a", "libopus", "-b:a", f"{addon_prefs.opus_bitrate}k"]
+    return []
+
+
+# Formats to view a whole sample frame of the given size as one item, see split_inputs().
+FRAME_ITEM_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+class CaptureSession:
+    """A long-lived ffmpeg process capturing from audio devices, reused across takes.
+
+    ffmpeg streams raw PCM through a pipe and a reader thread writes it to the files of the
+    current take, if any. Starting or stopping a take only opens or closes files, so the
+    devices are kept open and there is no process startup latency between takes.
+
+    Several devices are captured by the same process, with their channels merged side by side
+    in each sample frame, so that all inputs share one clock and start at the same sample.
+    The reader thread splits them again, into one file per device.
+
+    ffmpeg's log and progress are read from stderr by a monitor thread, which counts the
+    overruns it reports. With the audio received, this tells whether takes lost any audio.
+    """
+
+    chunk_size = 16384  # Bytes to read from the pipe at most at a time, per device.
+
+    def __init__(
+        self,
+        audio_devices,
+        sample_rate=CAPTURE_SAMPLE_RATE,
+        num_channels=CAPTURE_CHANNELS,
+        ring_duration=CAPTURE_RING_BUFFER_DURATION,
+    ):
+        self.audio_devices = tuple(audio_devices)
+        self.num_inputs = len(self.audio_devices)
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels  # Per device.
+        self.sample_width = CAPTURE_SAMPLE_WIDTH
+        self.input_frame_size = self.num_channels * self.sample_width
+        self.frame_size = self.num_inputs * self.input_frame_size
+        self.read_size = self.chunk_size * self.num_inputs
+
+        # The latest captured audio, to prepend to takes as pre-roll. See start_take().
+        self.ring_buffer = PCMRingBuffer(self._get_ring_buffer_size(ring_duration))
+        self._pre_roll = []
+        self.level_meter = LevelMeter(self.read_size // self.sample_width)
+
+        # Memory to split the merged stream into, reused for every block.
+        self._split_buffers = [bytearray(self.chunk_size) for _ in range(self.num_inputs)]
+        if np:
+            self._split_arrays = [np.frombuffer(b, dtype=np.uint8) for b in self._split_buffers]
+
+        self.process = None
+        self.returncode = None
+        self.args = []
+        self._reader = None
+        self._lock = threading.Lock()
+        self._writers = None
+        self._on_take_audio = None  # Called once audio is written to the take, see start_take().
+        # Loudness of the audio written to the current take, per device. See start_take().
+        self.loudness_meters = []
+        self.last_used = time.monotonic()
+        # When the first sample written to the current take was captured (time.monotonic()),
+        # including the pre-roll, and when the first one captured since the take started was.
+        self.first_sample_time = None
+        self.first_live_sample_time = None
+        self.take_start_time = None
+        # Sample frames written to the current take, and when the latest ones were captured.
+        self.take_num_frames = 0
+        self.last_read_time = None
+        # Sample frames of the current take in its WAV files as of the last requested sync.
+        self.take_synced_frames = 0
+        self._sync_requested = False
+
+        # Capture health, see get_take_health(). Overruns are counted for the session and take.
+        self._monitor = None
+        self.num_overruns = 0
+        self.take_num_overruns = 0
+        self.take_max_read_gap = 0.0  # Longest time without audio from ffmpeg during the take.
+        self.last_message = ""  # The latest message ffmpeg logged.
+        self.progress = {}  # The latest values of ffmpeg's -progress output.
+
+    @property
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def capture_format(self):
+        """The (sample rate, channels per device) of the captured audio."""
+        return self.sample_rate, self.num_channels
+
+    def _get_ring_buffer_size(self, duration):
+        duration = max(duration, CAPTURE_RING_BUFFER_DURATION)
+        return int(duration * self.sample_rate) * self.frame_size
+
+    def reserve_pre_roll(self, duration):
+        """Make sure that enough of the latest audio is kept to prepend duration seconds."""
+
+        size = self._get_ring_buffer_size(duration)
+        if size > self.ring_buffer.size:
+            with self._lock:
+                self.ring_buffer.resize(size)
+
+    @property
+    def is_recording(self):
+        return self._writers is not None
+
+    def start(self):
+        """Start the ffmpeg process and open the audio devices."""
+
+        # At this point ffmpeg should exist as the operator poll() would have failed.
+        assert ffmpeg_exe_path and os_platform in {'Linux', 'Windows'}
+
+        # Set platform dependent arguments.
+        input_args = []
+        for audio_device in self.audio_devices:
+            if os_platform == 'Linux':
+                input_args += ["-f", "alsa", "-i", audio_device]
+            else:  # 'Windows'
+                input_args += ["-f", "dshow", "-i", f"audio={audio_device}"]
+
+        if self.num_inputs == 1:
+            format_args = ["-ar", str(self.sample_rate), "-ac", str(self.num_channels)]
+        else:
+            # Convert each device to the same format, then merge their channels in one stream.
+            layout = {1: "mono", 2: "stereo"}.get(self.num_channels, f"{self.num_channels}c")
+            filters = [
+                f"[{i}:a]aformat=sample_fmts=s16:sample_rates={self.sample_rate}"
+                f":channel_layouts={layout}[a{i}]"
+                for i in range(self.num_inputs)
+            ]
+            merge_inputs = "".join(f"[a{i}]" for i in range(self.num_inputs))
+            filters.append(f"{merge_inputs}amerge=inputs={self.num_inputs}[out]")
+            format_args = ["-filter_complex", ";".join(filters), "-map", "[out]"]
+
+        # Stream raw PCM to stdout, flushing each packet so it arrives ASAP.
+        output_args = ["-vn"] + format_args + [
+            "-f", "s16le",
+            "-flush_packets", "1",
+            "pipe:1",
+        ]
+
+        # Only warnings and the progress go to stderr, to be parsed by the monitor thread.
+        log_args = ["-hide_banner", "-nostats", "-loglevel", "warning", "-progress", "pipe:2"]
+        self.args = [ffmpeg_exe_path] + log_args + input_args + output_args
+        # Note: stdin is a pipe so ffmpeg can be asked to quit gracefully with 'q'.
+        self.process = Popen(self.args, stdin=PIPE, stdout=PIPE, stderr=PIPE, bufsize=0)
+
+        self._reader = threading.Thread(
+            target=self._read_loop, name="push_to_talk_capture", daemon=True
+        )
+        self._reader.start()
+        self._monitor = threading.Thread(
+            target=self._monitor_loop, name="push_to_talk_capture_monitor", daemon=True
+        )
+        self._monitor.start()
+
+        log.debug("PushToTalk: Started audio capture process")
+        log.debug(f"PushToTalk: {self.args}")
+
+    def _read_loop(self):
+        buffer = bytearray(self.read_size)
+        view = memoryview(buffer)
+        pipe = self.process.stdout
+        carry = 0  # Bytes of an incomplete sample frame left over from the previous read.
+
+        while True:
+            num_read = pipe.readinto(view[carry:])
+            if not num_read:
+                break  # ffmpeg exited.
+
+            # Only hand out whole sample frames so that takes always start aligned.
+            num_bytes = carry + num_read
+            aligned = num_bytes - num_bytes % self.frame_size
+            block = view[:aligned]
+            self.level_meter.update(block)
+            notify = None
+            with self._lock:
+                now = time.monotonic()
+                if self._writers and self.first_sample_time is not None:
+                    read_gap = now - self.last_read_time
+                    self.take_max_read_gap = max(self.take_max_read_gap, read_gap)
+                self.last_read_time = now
+                # Write out the pre-roll before the ring buffer it points into is overwritten.
+                self._write_pre_roll()
+                self.ring_buffer.write(block)
+                if self._writers:
+                    if self.first_live_sample_time is None:
+                        # The chunk holds audio captured up until now: find when it started.
+                        chunk_duration = aligned / self.frame_size / self.sample_rate
+                        chunk_start_time = self.last_read_time - chunk_duration
+                        if self.first_sample_time is None:
+                            self.first_sample_time = chunk_start_time
+                        # Part of the chunk may have been captured before the take started.
+                        self.first_live_sample_time = max(chunk_start_time, self.take_start_time)
+                    self.take_num_frames += aligned // self.frame_size
+                    self._write_take(block)
+                    if self._sync_requested:
+                        self._sync_take()
+                    notify, self._on_take_audio = self._on_take_audio, None
+            if notify:
+                notify()
+            carry = num_bytes - aligned
+            if carry:
+                view[:carry] = view[aligned:num_bytes]
+
+        log.debug("PushToTalk: audio capture stream ended")
+
+    def _monitor_loop(self):
+        for line in self.process.stderr:
+            line = line.decode(errors='replace').strip()
+            key, sep, value = line.partition("=")
+            if sep and key in PROGRESS_KEYS:
+                self.progress[key] = value
+            elif OVERRUN_PATTERN.search(line):
+                with self._lock:
+                    self.num_overruns += 1
+                    if self._writers is not None:
+                        self.take_num_overruns += 1
+                self.last_message = line
+                log.debug(f"PushToTalk: ffmpeg: {line}")
+            elif line:
+                self.last_message = line
+                log.warning(f"PushToTalk: ffmpeg: {line}")
+
+    def _write_pre_roll(self):
+        piece_size = self.read_size - self.read_size % self.frame_size
+        for segment in self._pre_roll:
+            for piece_start in range(0, len(segment), piece_size):
+                self._write_take(segment[piece_start:piece_start + piece_size])
+        self._pre_roll = []
+
+    def _write_take(self, block):
+        """Write a block of captured audio to the files of the current take."""
+
+        inputs = [block] if self.num_inputs == 1 else self.split_inputs(block)
+        for writer, data in zip(self._writers, inputs):
+            writer.write(data)
+        for meter, data in zip(self.loudness_meters, inputs):
+            meter.update(data)
+
+    def _sync_take(self):
+        self._sync_requested = False
+        for writer in self._writers:
+            if isinstance(writer, WavWriter):
+                writer.sync()
+        self.take_synced_frames = self.take_num_frames
+
+    def request_sync(self):
+        """Have the reader thread sync the take's WAV files after its next read.
+
+        Their headers then have the size of the audio written until then, as do the files on
+        disk. take_synced_frames is updated once done. See WavWriter.sync().
+        """
+
+        self._sync_requested = True
+
+    def split_inputs(self, block):
+        """Split a block of merged sample frames into the audio of each device.
+
+        Return views on memory that is reused for the next block.
+        """
+
+        num_frames = len(block) // self.frame_size
+        size = num_frames * self.input_frame_size
+        if np:
+            frames = np.frombuffer(block, dtype=np.uint8).reshape(
+                num_frames, self.num_inputs, self.input_frame_size
+            )
+            for i, array in enumerate(self._split_arrays):
+                np.copyto(array[:size].reshape(num_frames, self.input_frame_size), frames[:, i])
+            return [memoryview(buffer)[:size] for buffer in self._split_buffers]
+
+        item_format = FRAME_ITEM_FORMATS.get(self.input_frame_size)
+        if item_format:
+            # View each frame of a device as one item, to pick every other one with a slice.
+            items = block.cast('B').cast(item_format)
+            for i, buffer in enumerate(self._split_buffers):
+                memoryview(buffer).cast(item_format)[:num_frames] = items[i::self.num_inputs]
+            return [memoryview(buffer)[:size] for buffer in self._split_buffers]
+
+        return [
+            b"".join(
+                block[offset:offset + self.input_frame_size]
+                for offset in range(i * self.input_frame_size, len(block), self.frame_size)
+            )
+            for i in range(self.num_inputs)
+        ]
+
+    def start_take(
+        self,
+        filepaths,
+        codec_args=(),
+        buffer_size=WRITE_BUFFER_SIZE,
+        sync_interval=SYNC_INTERVAL,
+        pre_roll=0.0,
+        on_audio=None,
+    ):
+        """Start writing the captured audio to new files, one per device.
+
+        The files are encoded with codec_args if given, or saved as WAV otherwise. They are
+        written in chunks of buffer_size bytes and synced every sync_interval seconds.
+        Their loudness is measured as they are written, if NumPy is available.
+        Up to pre_roll seconds of the audio captured before this are prepended.
+        on_audio is called without arguments from the reader thread once audio was written.
+        """
+
+        writers = []
+        for filepath in filepaths:
+            if codec_args:
+                writer = EncoderWriter(
+                    filepath,
+                    self.sample_rate,
+                    self.num_channels,
+                    self.sample_width,
+                    codec_args,
+                    buffer_size,
+                    sync_interval,
+                )
+            else:
+                writer = WavWriter(
+                    filepath,
+                    self.sample_rate,
+                    self.num_channels,
+                    self.sample_width,
+                    buffer_size,
+                    sync_interval,
+                )
+            writers.append(writer)
+        loudness_meters = []
+        if np:
+            loudness_meters = [
+                LoudnessMeter(self.sample_rate, self.num_channels) for _ in filepaths
+            ]
+        with self._lock:
+            self.first_sample_time = None
+            self.first_live_sample_time = None
+            self.take_start_time = time.monotonic()
+            self.take_num_frames = 0
+            self.take_synced_frames = 0
+            self._sync_requested = False
+            self.take_num_overruns = 0
+            self.take_max_read_gap = 0.0
+            self._writers = writers
+            self._on_take_audio = on_audio
+            self.loudness_meters = loudness_meters
+            if pre_roll > 0.0 and self.last_read_time is not None:
+                # Views on the buffered audio, written out by the reader thread. No copies.
+                num_frames = int(pre_roll * self.sample_rate)
+                self._pre_roll = self.ring_buffer.latest(num_frames * self.frame_size)
+                num_frames = sum(len(segment) for segment in self._pre_roll) // self.frame_size
+                self.take_num_frames = num_frames
+                self.first_sample_time = self.last_read_time - num_frames / self.sample_rate
+        self.last_used = time.monotonic()
+
+    def get_take_position(self, now):
+        """Seconds of audio of the current take captured at time now, by the audio clock.
+
+        Return None if no audio was captured yet.
+        """
+
+        with self._lock:
+            if self.first_sample_time is None:
+                return None
+            # Only the time since the latest read, a few milliseconds, is by the system clock.
+            return self.take_num_frames / self.sample_rate + (now - self.last_read_time)
+
+    def get_take_health(self, now):
+        """Measurements of audio lost from the current take, by time now.
+
+        Return a dict with the overruns ffmpeg reported, the seconds of audio missing compared to
+        the time the take ran for, and the longest time without audio from ffmpeg in seconds.
+        """
+
+        with self._lock:
+            if self.first_sample_time is None:
+                return {'overruns': self.take_num_overruns, 'missing_audio': 0.0, 'read_gap': 0.0}
+            expected_duration = self.last_read_time - self.first_sample_time
+            missing_audio = expected_duration - self.take_num_frames / self.sample_rate
+            return {
+                'overruns': self.take_num_overruns,
+                'missing_audio': max(missing_audio, 0.0),
+                'read_gap': max(self.take_max_read_gap, now - self.last_read_time),
+            }
+
+    def get_take_warning(self, now):
+        """Describe how the current take lost audio, if it did, to warn the user live.
+
+        Return None if the capture is healthy so far.
+        """
+
+        if not self.is_alive:
+            return f"Audio capture stopped: {self.last_message or 'ffmpeg exited'}"
+        health = self.get_take_health(now)
+        if self.last_read_time is not None and now - self.last_read_time > CAPTURE_STALL_TIMEOUT:
+            return f"No audio from the device for {now - self.last_read_time:.1f} s"
+        if health['overruns']:
+            return f"Audio dropouts: {health['overruns']} buffer overruns"
+        if self.first_sample_time is not None:
+            tolerance = MISSING_AUDIO_TOLERANCE + (now - self.first_sample_time) * 0.001
+            if health['missing_audio'] > tolerance:
+                return f"Audio dropouts: {health['missing_audio'] * 1000:.0f} ms missing"
+        return None
+
+    def stop_take(self):
+        """Stop writing to the current take's files.
+
+        Return the take's writers, which the caller should close to finish the files.
+        """
+
+        with self._lock:
+            if self._writers:
+                self._write_pre_roll()  # In case no audio came in since the take started.
+            writers = self._writers or []
+            self._writers = None
+            self._on_take_audio = None
+        self.last_used = time.monotonic()
+        return writers
+
+    def close(self, timeout=3):
+        """Stop capturing: ask ffmpeg to quit and release the audio devices."""
+
+        for writer in self.stop_take():
+            writer.close()
+        if not self.process:
+            return
+
+        try:
+            self.process.stdin.write(b"q")
+            self.process.stdin.close()
+        except OSError:
+            pass  # ffmpeg already exited.
+
+        try:
+            self.process.wait(timeout)
+        except TimeoutExpired:
+            log.warning(f"Capture process did not gracefully shutdown within {timeout} seconds.")
+            self.process.kill()
+            self.process.wait()
+
+        if self._reader:
+            self._reader.join(timeout)
+        if self._monitor:
+            self._monitor.join(timeout)
+        self.process.stdout.close()
+        self.process.stderr.close()
+        self.returncode = self.process.returncode
+        self.process = None
+        log.debug("PushToTalk: Stopped audio capture process")
+
+
+# The capture session kept open between takes, if any.
+capture_session = None
+
+
+def get_capture_format(addon_prefs, scene):
+    """The (sample rate, channels) to capture at, from the preferences or the scene.
+
+    Following the scene's audio settings spares Blender from resampling takes at playback.
+    """
+
+    if addon_prefs.capture_sample_rate == 'SCENE':
+        sample_rate = scene.render.ffmpeg.audio_mixrate
+    else:
+        sample_rate = int(addon_prefs.capture_sample_rate)
+
+    if addon_prefs.capture_channels == 'SCENE':
+        # Microphones are mono or stereo, so surround layouts are captured as stereo.
+        num_channels = 1 if scene.render.ffmpeg.audio_channels == 'MONO' else 2
+    else:
+        num_channels = 1 if addon_prefs.capture_channels == 'MONO' else 2
+    return sample_rate, num_channels
+
+
+def get_capture_session(audio_devices, capture_format, pre_roll=0.0):
+    """Return a running capture session for the audio devices, starting one if needed.
+
+    The session captures at capture_format, a (sample rate, channels) tuple, and keeps at
+    least pre_roll seconds of the latest audio, to prepend to takes.
+    """
+
+    global capture_session
+
+    if capture_session and capture_session.is_alive:
+        if (
+            capture_session.audio_devices == tuple(audio_devices)
+            and capture_session.capture_format == tuple(capture_format)
+        ):
+            capture_session.reserve_pre_roll(pre_roll)
+            return capture_session
+    close_capture_session()
+
+    sample_rate, num_channels = capture_format
+    capture_session = CaptureSession(audio_devices, sample_rate, num_channels, pre_roll)
+    capture_session.start()
+    return capture_session
+
+
+def detach_capture_session():
+    """Take over the running capture session, so that the caller can close it."""
+
+    global capture_session
+
+    session = capture_session
+    capture_session = None
+    return session
+
+
+def close_capture_session():
+    """Release the audio device if it is kept open."""
+
+    session = detach_capture_session()
+    if session:
+        session.close()
+
+
+def close_idle_capture_session():
+    """Timer callback to release the audio device after it has not been used for a while."""
+
+    if not capture_session:
+        return None
+    if capture_session.is_recording:
+        return None  # The next take will schedule this check again when it finishes.
+
+    addon_prefs = bpy.context.preferences.addons[ADDON_ID].preferences
+    timeout = addon_prefs.armed_idle_timeout * 60
+    idle_time = time.monotonic() - capture_session.last_used
+    if not addon_prefs.keep_microphone_armed or idle_time >= timeout:
+        log.debug("PushToTalk: releasing idle audio device")
+        close_capture_session()
+        return None
+    return timeout - idle_time
+
+
+def keep_microphone_armed_update(self, context):
+    """Open or release the audio device when the user toggles keeping it armed."""
+
+    if not self.keep_microphone_armed:
+        if capture_session and not capture_session.is_recording:
+            close_capture_session()
+        return
+
+    if os_platform not in {'Linux', 'Windows'} or not ffmpeg_exe_path:
+        return  # On macOS, recording uses atunc which opens the device for each take.
+    audio_devices = get_audio_input_devices(self)
+    if not audio_devices:
+        return
+    get_capture_session(audio_devices, get_capture_format(self, context.scene), self.pre_roll)
+    if not bpy.app.timers.is_registered(close_idle_capture_session):
+        bpy.app.timers.register(close_idle_capture_session, first_interval=60)
+
+
+def capture_format_update(self, context):
+    """Reopen the armed audio device in the new format, so the next take starts right away."""
+
+    if capture_session and not capture_session.is_recording:
+        keep_microphone_armed_update(self, context)
+
+
+def pre_roll_update(self, context):
+    """Keep enough audio for the pre-roll, if the audio device is armed."""
+
+    if capture_session:
+        capture_session.reserve_pre_roll(self.pre_roll)
+
+
+# Recording Recovery ###############################################################################
+
+# Suffix of the file marking a sound file as being recorded. It is removed once the sound file
+# is complete, so a marker left behind means that Blender or ffmpeg crashed while recording.
+RECORDING_MARKER_SUFFIX = ".recording"
+# Seconds since a marked sound file was last written after which it's considered orphaned.
+# Recordings in progress are synced more often, at least every MAX_SYNC_INTERVAL, also in other
+# Blender instances.
+ORPHANED_RECORDING_AGE = 60.0
+
+# Sound files being recorded by this Blender instance.
+open_recordings = set()
+
+
+def add_recording_marker(filepath):
+    open_recordings.add(filepath)
+    try:
+        pathlib.Path(filepath + RECORDING_MARKER_SUFFIX).touch()
+    except OSError as err:
+        log.warning(f"PushToTalk: could not mark '{filepath}' as being recorded: {err}")
+
+
+def remove_recording_marker(filepath):
+    open_recordings.discard(filepath)
+    try:
+        os.remove(filepath + RECORDING_MARKER_SUFFIX)
+    except OSError:
+        pass
+
+
+def repair_wav_file(filepath):
+    """Fix the sizes in the header of an unfinished WAV file, dropping any partial frame."""
+
+    info = read_wav_info(filepath)
+    # The header has the size at the last sync, but more audio may have made it to disk.
+    available = os.path.getsize(filepath) - info['data_offset']
+    data_size = available - available % (info['num_channels'] * info['sample_width'])
+    data_end = info['data_offset'] + data_size
+    with open(filepath, "r+b") as f:
+        f.truncate(data_end)
+        f.seek(4)
+        f.write((data_end - 8).to_bytes(4, 'little'))
+        f.seek(info['data_offset'] - 4)
+        f.write(data_size.to_bytes(4, 'little'))
+
+
+def repair_encoded_file(filepath):
+    """Rewrite a compressed sound file that was not finished, to fix up its headers."""
+
+    base, extension = os.path.splitext(filepath)
+    repaired_filepath = f"{base}.repaired{extension}"
+    args = [
+        ffmpeg_exe_path, "-hide_banner", "-loglevel", "error", "-nostdin",
+        "-i", filepath, "-c", "copy", "-y", repaired_filepath,
+    ]
+    with Popen(args) as proc:
+        if proc.wait() != 0:
+            raise ValueError(f"ffmpeg could not read '{filepath}'")
+    os.replace(repaired_filepath, filepath)
+
+
+def recover_recordings(directory):
+    """Repair sound files left unfinished in a directory by a crash while recording.
+
+    Return the paths of the repaired files.
+    """
+
+    recovered = []
+    for marker_path in pathlib.Path(directory).glob("*" + RECORDING_MARKER_SUFFIX):
+        filepath = str(marker_path)[:-len(RECORDING_MARKER_SUFFIX)]
+        if filepath in open_recordings:
+            continue
+        try:
+            last_written = max(os.path.getmtime(filepath), os.path.getmtime(marker_path))
+        except FileNotFoundError:
+            marker_path.unlink(missing_ok=True)  # Nothing was recorded.
+            continue
+        except OSError:
+            continue
+        if time.time() - last_written < ORPHANED_RECORDING_AGE:
+            continue  # Possibly still being recorded, e.g. by another Blender.
+
+        try:
+            if filepath.lower().endswith(".wav"):
+                repair_wav_file(filepath)
+            elif ffmpeg_exe_path:
+                repair_encoded_file(filepath)
+            else:
+                continue  # Playable up to the crash as is, but only ffmpeg can fix it.
+        except (OSError, ValueError) as err:
+            log.warning(f"PushToTalk: could not recover the recording '{filepath}': {err}")
+            continue
+        marker_path.unlink(missing_ok=True)
+        log.warning(f"PushToTalk: recovered the interrupted recording '{filepath}'")
+        recovered.append(filepath)
+    return recovered
+
+
+def recover_recordings_async(directory):
+    """Look for and repair unfinished recordings on a background thread, see above."""
+
+    if not directory or not os.path.isdir(directory):
+        return
+    thread = threading.Thread(
+        target=recover_recordings, args=(directory,), name="push_to_talk_recover", daemon=True
+    )
+    thread.start()
+
+
+@bpy.app.handlers.persistent
+def recover_recordings_on_load(_dummy):
+    """Repair unfinished recordings in the directory of the loaded blend file's sounds."""
+
+    addon_prefs = bpy.context.preferences.addons[ADDON_ID].preferences
+    recover_recordings_async(bpy.path.abspath(addon_prefs.sounds_dir))
+
+
+# Take Catalogue ###################################################################################
+
+# File in each sounds directory listing the takes recorded there, one JSON object per line.
+CATALOGUE_FILENAME = ".push_to_talk_takes.jsonl"
+
+
+class TakeCatalogue:
+    """Index of the takes recorded in a directory, to list them without scanning it.
+
+    Takes are looked up by file name. The index is kept in memory and appended to on disk, as
+    lines of JSON: a take's info when it's added, and a removal record when it's deleted.
+    It's reloaded when another Blender changes it, and compacted when mostly removals.
+    """
+
+    check_interval = 1.0  # Seconds between checks for changes on disk.
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.filepath = os.path.join(directory, CATALOGUE_FILENAME)
+        self.takes = {}  # File name: info.
+        self.num_lines = 0
+        self._file_state = None  # (mtime, size) of the file when it was loaded.
+        self._last_checked = 0.0
+        self.load()
+
+    def _get_file_state(self):
+        try:
+            stat_result = os.stat(self.filepath)
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def load(self):
+        self.takes = {}
+        self.num_lines = 0
+        self._file_state = self._get_file_state()
+        self._last_checked = time.monotonic()
+        if self._file_state is None:
+            return
+        try:
+            with open(self.filepath, encoding="utf-8") as f:
+                for line in f:
+                    self.num_lines += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # E.g. a line cut short by a crash.
+                    if record.get('removed'):
+                        self.takes.pop(record['file'], None)
+                    else:
+                        self.takes[record['file']] = record
+        except OSError as err:
+            log.warning(f"PushToTalk: could not read the take catalogue '{self.filepath}': {err}")
+
+    def refresh(self):
+        """Reload the catalogue if it changed on disk. Cheap to call often."""
+
+        now = time.monotonic()
+        if now - self._last_checked < self.check_interval:
+            return
+        self._last_checked = now
+        if self._get_file_state() != self._file_state:
+            self.load()
+
+    def _append(self, records):
+        self.refresh()
+        with open(self.filepath, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        self.num_lines += len(records)
+        self._file_state = self._get_file_state()
+
+    def get(self, filename):
+        return self.takes.get(filename)
+
+    def recent(self, count):
+        """The latest takes added, newest first."""
+        return list(itertools.islice(reversed(self.takes.values()), count))
+
+    @property
+    def total_size(self):
+        return sum(take.get('size', 0) for take in self.takes.values())
+
+    def add(self, record):
+        """Add a take, given its info as a dict with at least its 'file' name."""
+
+        self._append([record])
+        self.takes[record['file']] = record
+
+    def remove(self, filenames):
+        self._append([{'file': filename, 'removed': True} for filename in filenames])
+        for filename in filenames:
+            self.takes.pop(filename, None)
+        if self.num_lines > 100 and self.num_lines > 2 * len(self.takes):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the catalogue with only the takes that are still there."""
+
+        temp_filepath = self.filepath + ".tmp"
+        with open(temp_filepath, "w", encoding="utf-8") as f:
+            for record in self.takes.values():
+                f.write(json.dumps(record) + "\n")
+        os.replace(temp_filepath, self.filepath)
+        self.num_lines = len(self.takes)
+        self._file_state = self._get_file_state()
+
+
+# Catalogues of the sounds directories used in this session, by directory.
+take_catalogues = {}
+
+
+def get_take_catalogue(directory):
+    """Get the catalogue of a sounds directory, loading it the first time."""
+
+    directory = os.path.normcase(os.path.abspath(directory))
+    catalogue = take_catalogues.get(directory)
+    if catalogue is None:
+        catalogue = take_catalogues[directory] = TakeCatalogue(directory)
+    else:
+        catalogue.refresh()
+    return catalogue
+
+
+def catalogue_take(take, scene, sound_strips):
+    """Add the sound files of a finished take to the catalogue of their directory."""
+
+    fps = scene.render.fps / scene.render.fps_base
+    recorded = datetime.datetime.fromtimestamp(
+        time.time() - (time.monotonic() - take.time_invoked)
+    ).isoformat(timespec='seconds')
+    try:
+        catalogue = get_take_catalogue(os.path.dirname(take.filepath))
+        for filepath, audio_device, sound_strip in zip(
+            take.filepaths, take.audio_devices, sound_strips
+        ):
+            catalogue.add({
+                'file': os.path.basename(filepath),
+                'recorded': recorded,
+                'duration': round(sound_strip.frame_duration / fps, 3),
+                'size': os.path.getsize(filepath),
+                'device': audio_device,
+                'blend': bpy.data.filepath,
+                'scene': scene.name,
+                'frame_start': sound_strip.frame_final_start,
+                'frame_end': sound_strip.frame_final_end,
+            })
+    except OSError as err:
+        log.warning(f"PushToTalk: could not add the take to the catalogue: {err}")
+
+
+def get_sounds_used_in_blend_file(blend_filepath):
+    """Paths of the sound files used in a blend file, by linking its sounds temporarily."""
+
+    # Leave the open file as it was: only what is linked here is removed again.
+    libraries_before = set(bpy.data.libraries)
+    sounds_before = set(bpy.data.sounds)
+    with bpy.data.libraries.load(blend_filepath, link=True) as (data_from, data_to):
+        data_to.sounds = list(data_from.sounds)
+    sound_filepaths = {
+        bpy.path.abspath(sound.filepath, library=sound.library)
+        for sound in data_to.sounds
+        if sound
+    }
+    # The sounds too, for when the file, or a library it links, was linked already.
+    for sound in data_to.sounds:
+        if sound and sound not in sounds_before:
+            bpy.data.sounds.remove(sound)
+    # With the libraries the blend file links to itself.
+    for library in list(bpy.data.libraries):
+        if library not in libraries_before:
+            bpy.data.libraries.remove(library)
+    return sound_filepaths
+
+
+def get_sounds_used_in_saved_blend_file(blend_filepath):
+    """Paths of the sound files used in the saved copy of the open blend file.
+
+    Blender can't link from the open file itself, so a copy of it is linked from instead. The
+    copy is made next to it, for relative paths to point to the same files.
+    """
+
+    fd, copy_filepath = tempfile.mkstemp(
+        suffix=".blend", prefix=".push_to_talk_", dir=os.path.dirname(blend_filepath)
+    )
+    os.close(fd)
+    try:
+        shutil.copyfile(blend_filepath, copy_filepath)
+        return get_sounds_used_in_blend_file(copy_filepath)
+    finally:
+        os.remove(copy_filepath)
+
+
+def find_unused_takes(catalogue):
+    """Find the takes in the catalogue that are not used by any blend file around.
+
+    The blend files checked are the current one, with its unsaved changes and as it is saved,
+    and the others in its directory and in the sounds directory. Return (file names, directories
+    searched for blend files, blend files checked).
+    """
+
+    # With the sounds of deleted strips, which have no users: undo can bring the strips back.
+    used_filepaths = {
+        bpy.path.abspath(sound.filepath, library=sound.library) for sound in bpy.data.sounds
+    }
+    if bpy.data.filepath and os.path.isfile(bpy.data.filepath):
+        try:
+            used_filepaths |= get_sounds_used_in_saved_blend_file(bpy.data.filepath)
+        except (OSError, RuntimeError) as err:
+            raise RuntimeError(f"could not read '{bpy.data.filepath}': {err}") from err
+    directories = sorted({os.path.dirname(bpy.data.filepath), catalogue.directory} - {""})
+    blend_filepaths = set()
+    for directory in directories:
+        blend_filepaths.update(str(path) for path in pathlib.Path(directory).glob("*.blend"))
+    blend_filepaths.discard(bpy.data.filepath)
+    for blend_filepath in sorted(blend_filepaths):
+        try:
+            used_filepaths |= get_sounds_used_in_blend_file(blend_filepath)
+        except (OSError, RuntimeError) as err:
+            raise RuntimeError(f"could not read '{blend_filepath}': {err}") from err
+
+    used_filenames = {
+        os.path.basename(filepath)
+        for filepath in used_filepaths
+        if os.path.normcase(os.path.dirname(os.path.abspath(filepath))) == catalogue.directory
+    }
+    # Takes still being recorded or finished are in use too.
+    busy_filepaths = set(open_recordings)
+    for take in pending_takes:
+        busy_filepaths.update(take.filepaths)
+    used_filenames.update(os.path.basename(filepath) for filepath in busy_filepaths)
+
+    unused = [filename for filename in catalogue.takes if filename not in used_filenames]
+    blend_filepaths_checked = [bpy.data.filepath or "(unsaved file)"] + sorted(blend_filepaths)
+    return unused, directories, blend_filepaths_checked
+
+
+# Waveform Thumbnails ##############################################################################
+
+# Directory in each sounds directory with the peaks of the takes, to draw their waveforms without
+# reading the sound files again. One small file per take, see save_peaks_file().
+PEAKS_DIRNAME = ".push_to_talk_peaks"
+PEAKS_FILE_MAGIC = b"PTTPEAK1"
+# Size of the waveform thumbnails in pixels, with one peak per column.
+WAVEFORM_SIZE = (64, 32)
+# Level at the bottom of the waveform scale, in dBFS.
+WAVEFORM_FLOOR_DB = -60.0
+WAVEFORM_COLOR = (0.45, 0.75, 0.85, 1.0)
+# Number of takes whose waveform thumbnails are kept in memory.
+WAVEFORM_CACHE_SIZE = 256
+
+
+def get_peaks_filepath(filepath):
+    directory, filename = os.path.split(filepath)
+    return os.path.join(directory, PEAKS_DIRNAME, filename + ".peaks")
+
+
+def get_file_state(filepath):
+    """The (mtime, size) of a file, which change when it's written to, or None if missing."""
+
+    try:
+        stat_result = os.stat(filepath)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def load_peaks_file(filepath, file_state):
+    """Read the peaks of a sound file saved by save_peaks_file().
+
+    Return the peaks as bytes, or None if there are none for this version of the file.
+    """
+
+    try:
+        with open(get_peaks_filepath(filepath), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    header_size = len(PEAKS_FILE_MAGIC) + 16
+    if len(data) < header_size or not data.startswith(PEAKS_FILE_MAGIC):
+        return None
+    mtime_ns = int.from_bytes(data[8:16], 'little')
+    size = int.from_bytes(data[16:24], 'little')
+    if (mtime_ns, size) != file_state:
+        return None  # The sound file changed since.
+    return data[header_size:]
+
+
+def save_peaks_file(filepath, file_state, peaks):
+    """Save the peaks of a sound file next to it, with the state of the file they are of.
+
+    The file has a magic number, the sound file's mtime and size as 64-bit little endian
+    integers, then one byte per peak.
+    """
+
+    peaks_filepath = get_peaks_filepath(filepath)
+    temp_filepath = peaks_filepath + ".tmp"
+    os.makedirs(os.path.dirname(peaks_filepath), exist_ok=True)
+    with open(temp_filepath, "wb") as f:
+        f.write(PEAKS_FILE_MAGIC)
+        f.write(file_state[0].to_bytes(8, 'little'))
+        f.write(file_state[1].to_bytes(8, 'little'))
+        f.write(peaks)
+    os.replace(temp_filepath, peaks_filepath)
+
+
+def remove_peaks_file(filepath):
+    try:
+        os.remove(get_peaks_filepath(filepath))
+    except OSError:
+        pass  # There were none.
+
+
+def get_waveform_peaks(filepath, file_state):
+    """Peaks of a sound file to draw its waveform thumbnail, as one byte per column.
+
+    They are read from the peaks file if there is one for this version of the sound file, or
+    computed and saved to it. Runs on worker threads, since it can read the whole file.
+    """
+
+    peaks = load_peaks_file(filepath, file_state)
+    if peaks is not None and len(peaks) == WAVEFORM_SIZE[0]:
+        return peaks
+
+    levels = compute_waveform_peaks(filepath, WAVEFORM_SIZE[0])
+    # On a dB scale, so quiet takes still show their shape.
+    peaks = bytes(
+        round(min(max(1.0 - level_to_db(level) / WAVEFORM_FLOOR_DB, 0.0), 1.0) * 255)
+        for level in levels
+    )
+    try:
+        save_peaks_file(filepath, file_state, peaks)
+    except OSError as err:
+        log.debug(f"PushToTalk: could not save the peaks of '{filepath}': {err}")
+    return peaks
+
+
+def render_waveform(peaks):
+    """RGBA pixels of a waveform thumbnail of WAVEFORM_SIZE, as a flat sequence of floats."""
+
+    width, height = WAVEFORM_SIZE
+    if np:
+        half_heights = np.frombuffer(peaks, dtype=np.uint8) * (height / 2 / 255)
+        # Distance of each row from the middle, which is 0 when height is odd.
+        distances = np.abs(np.arange(height, dtype=np.float32) + 0.5 - height / 2)
+        mask = distances[:, np.newaxis] <= np.maximum(half_heights, 0.5)[np.newaxis, :]
+        pixels = np.zeros((height, width, 4), dtype=np.float32)
+        pixels[mask] = WAVEFORM_COLOR
+        return pixels.ravel()
+
+    empty = (0.0, 0.0, 0.0, 0.0)
+    half_heights = [max(peak * height / 2 / 255, 0.5) for peak in peaks]
+    pixels = []
+    for row in range(height):
+        distance = abs(row + 0.5 - height / 2)
+        for half_height in half_heights:
+            pixels.extend(WAVEFORM_COLOR if distance <= half_height else empty)
+    return pixels
+
+
+class WaveformCache:
+    """Waveform thumbnails of sound files, as icons to draw in the UI.
+
+    The thumbnails of the files drawn most recently are kept, up to max_size. Missing ones are
+    loaded in the background on the event loop (see get_waveform_peaks()), so drawing is never
+    held up by reading sound files. Files are checked for changes every check_interval seconds.
+    """
+
+    check_interval = 2.0
+
+    def __init__(self, max_size=WAVEFORM_CACHE_SIZE):
+        self.max_size = max_size
+        # File path: [file state, icon id, when the file was checked], least recent first.
+        self.entries = collections.OrderedDict()
+        self.loading = set()  # File paths.
+        self.previews = None
+
+    def get_icon(self, filepath):
+        """Icon id of the waveform of a sound file, or 0 while it's loading. Cheap to call."""
+
+        now = time.monotonic()
+        entry = self.entries.get(filepath)
+        if entry:
+            self.entries.move_to_end(filepath)
+            if now - entry[2] < self.check_interval:
+                return entry[1]
+            entry[2] = now
+        file_state = get_file_state(filepath)
+        if entry and file_state == entry[0]:
+            return entry[1]
+
+        if file_state is None:
+            self._add(filepath, [None, 0, now])  # Check again later, it may show up.
+        elif filepath not in self.loading:
+            self.loading.add(filepath)
+            run_coroutine(self._load(filepath, file_state))
+        return entry[1] if entry else 0
+
+    async def _load(self, filepath, file_state):
+        loop = asyncio.get_running_loop()
+        try:
+            peaks = await loop.run_in_executor(None, get_waveform_peaks, filepath, file_state)
+        except (OSError, ValueError) as err:
+            log.debug(f"PushToTalk: could not draw the waveform of '{filepath}': {err}")
+            peaks = None
+        finally:
+            self.loading.discard(filepath)
+
+        # Remember files that can't be read too, to not try again until they change.
+        icon_id = self._set_thumbnail(filepath, peaks) if peaks is not None else 0
+        self._add(filepath, [file_state, icon_id, time.monotonic()])
+
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'SEQUENCE_EDITOR':
+                    area.tag_redraw()
+
+    def _add(self, filepath, entry):
+        self.entries[filepath] = entry
+        self.entries.move_to_end(filepath)
+        if not entry[1] and self.previews and filepath in self.previews:
+            del self.previews[filepath]
+        while len(self.entries) > self.max_size:
+            evicted, _ = self.entries.popitem(last=False)
+            if self.previews and evicted in self.previews:
+                del self.previews[evicted]  # Releases the icon.
+
+    def _set_thumbnail(self, filepath, peaks):
+        if self.previews is None:
+            self.previews = bpy.utils.previews.new()
+        preview = self.previews.get(filepath) or self.previews.new(filepath)
+        pixels = render_waveform(peaks)
+        # Set both sizes, the icon is drawn for small scales and the image for large ones.
+        preview.icon_size = WAVEFORM_SIZE
+        preview.icon_pixels_float.foreach_set(pixels)
+        preview.image_size = WAVEFORM_SIZE
+        preview.image_pixels_float.foreach_set(pixels)
+        return preview.icon_id
+
+    def clear(self):
+        self.entries.clear()
+        self.loading.clear()
+        if self.previews is not None:
+            bpy.utils.previews.remove(self.previews)
+            self.previews = None
+
+
+waveform_cache = WaveformCache()
+
+
+# Take Telemetry ###################################################################################
+
+# File to log performance measurements of each take to, set on register.
+telemetry_path = None
+# Size after which the telemetry log is rotated, keeping one previous log.
+TELEMETRY_MAX_SIZE = 1024 * 1024
+# Measurements of the latest takes, oldest first, for the statistics in the panel.
+recent_telemetry = collections.deque(maxlen=100)
+# Percentiles of recent_telemetry, as {measurement: (p50, p95)}. See update_telemetry_stats().
+telemetry_stats = {}
+
+
+def log_take_telemetry(record):
+    """Append a take's measurements to the telemetry log, as a line of JSON."""
+
+    if not telemetry_path:
+        return
+    try:
+        if get_file_size(telemetry_path) > TELEMETRY_MAX_SIZE:
+            os.replace(telemetry_path, telemetry_path.with_suffix(".1.jsonl"))
+        with open(telemetry_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as err:
+        log.warning(f"PushToTalk: could not log the take's performance: {err}")
+
+
+def load_take_telemetry():
+    """Load the measurements of the latest takes from the telemetry log, for statistics."""
+
+    recent_telemetry.clear()
+    telemetry_stats.clear()
+    if not telemetry_path:
+        return
+
+    # Only read the end of the log: lines are a few hundred bytes.
+    size = get_file_size(telemetry_path)
+    tail_size = 1024 * recent_telemetry.maxlen
+    try:
+        with open(telemetry_path, "rb") as f:
+            f.seek(max(size - tail_size, 0))
+            lines = f.read().splitlines()
+    except OSError:
+        return
+    if size > tail_size:
+        lines = lines[1:]  # Likely cut short.
+    for line in lines:
+        try:
+            recent_telemetry.append(json.loads(line))
+        except ValueError:
+            continue
+    update_telemetry_stats()
+
+
+def get_file_size(filepath):
+    try:
+        return os.path.getsize(filepath)
+    except OSError:
+        return 0
+
+
+def get_percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def update_telemetry_stats():
+    """Compute the percentiles of the recent takes' measurements, to show in the panel."""
+
+    telemetry_stats.clear()
+    for name in ('first_sample', 'finalize', 'write_rate'):
+        values = sorted(
+            record[name] for record in recent_telemetry if record.get(name) is not None
+        )
+        if values:
+            telemetry_stats[name] = (get_percentile(values, 0.5), get_percentile(values, 0.95))
+
+
+# Takes ############################################################################################
+
+
+class ClockFit:
+    """Least squares line through (audio time, timeline frame) points, fitted incrementally.
+
+    Tells where the recording started in the timeline and how fast the timeline played
+    relative to the audio clock, which drift apart when playback drops frames under load.
+    Only running sums are kept, relative to the first point for numerical precision.
+    """
+
+    def __init__(self):
+        self.num_points = 0
+        self._origin = None
+        self._sum_x = self._sum_y = 0.0
+        self._sum_xx = self._sum_xy = self._sum_yy = 0.0
+        self.span = 0.0  # Audio time between the first and last points.
+
+    def add(self, x, y):
+        if self._origin is None:
+            self._origin = (x, y)
+        x -= self._origin[0]
+        y -= self._origin[1]
+        self.num_points += 1
+        self._sum_x += x
+        self._sum_y += y
+        self._sum_xx += x * x
+        self._sum_xy += x * y
+        self._sum_yy += y * y
+        self.span = max(self.span, x)
+
+    def solve(self):
+        """Return (intercept, slope, RMS residual) of the fitted line, or None if too few points."""
+
+        n = self.num_points
+        if n < 3:
+            return None
+        var_x = self._sum_xx - self._sum_x * self._sum_x / n
+        if var_x <= 0.0:
+            return None
+        cov_xy = self._sum_xy - self._sum_x * self._sum_y / n
+        var_y = self._sum_yy - self._sum_y * self._sum_y / n
+        slope = cov_xy / var_x
+        intercept = (self._sum_y - slope * self._sum_x) / n
+        residual = math.sqrt(max(var_y - slope * cov_xy, 0.0) / n)
+        origin_x, origin_y = self._origin
+        return origin_y + intercept - slope * origin_x, slope, residual
+
+
+# Requirements to place a take from its ClockFit: seconds of audio covered by the points,
+# and the largest RMS deviation from the fit, in frames. Otherwise the playhead jumped.
+CLOCK_FIT_MIN_SPAN = 1.0
+CLOCK_FIT_MAX_RESIDUAL = 1.0
+# Drift between the playback and the audio that is corrected, see Take.correct_drift(): at
+# least a frame by the end of the take, and at most a few percent of the speed.
+MIN_DRIFT_FRAMES = 1.0
+MAX_DRIFT_CORRECTION = 0.05
+
+
+class Take:
+    """A single recording, from clicking record until its sound strip is added to the edit.
+
+    A take records one sound file per audio input, which get parallel sound strips.
+    """
+
+    def __init__(self, filepaths, scene):
+        self.filepaths = list(filepaths)
+        self.scene_name = scene.name
+        self.frame_start = scene.frame_current
+        self.frame_stopped = None
+        self.channel = 1
+        self.placeholder_name = ""
+        self.is_cancelled = False
+
+        # Settings to trim leading and trailing silence: threshold as a linear level (or None
+        # to not trim) and padding in seconds. The audible range is found when finalizing.
+        self.trim_threshold = None
+        self.trim_padding = 0.0
+        self.audible_range = None
+
+        # Loudness to normalize the volume of the sound strips to, in LUFS, or None to leave
+        # it as is, and the maximum true peak in dBTP. Loudness is measured while recording.
+        self.loudness_target = None
+        self.peak_limit = 0.0
+        self.loudness_meters = []
+        self.loudness = []  # (Integrated loudness, true peak) per sound file.
+
+        # The audio devices recorded, one per sound file.
+        self.audio_devices = []
+        # Whichever records the audio: an atunc process, or an ffmpeg capture session.
+        self.recording_process = None
+        self.capture_session = None
+        # Left to finish off the main thread, once recording has stopped.
+        self.writers = []
+        self.session_to_close = None
+        self.finalized = threading.Event()
+
+        # Timestamps (time.monotonic()) of the take, to place the sound strip accurately.
+        self.time_invoked = None
+        self.time_frame_start = None  # When the playhead was at frame_start and playing.
+        self.time_first_sample = None  # Captured after the take started, see latency.
+        self.time_audio_start = None  # Of the audio in the file, which may start with pre-roll.
+        self.time_stopped = None
+        self.time_finalized = None
+        self.duration = None  # Seconds of audio recorded, known once stopped.
+
+        # Timeline frames against the audio captured, sampled while recording. See ClockFit.
+        self.clock_fit = ClockFit()
+        # Timeline frames played per audio frame, relative to the scene's frame rate.
+        self.playback_speed = None
+        self.drift_frames = 0.0  # How far apart playback and the audio were by the end.
+        self.correct_drift_speed = False
+
+        # Main thread ticks that ran for this take, see update_on_main_thread().
+        self.num_ticks = 0
+        self.tick_duration_total = 0.0
+
+        # What recorded the take and how it went, for the telemetry log.
+        self.backend = ""
+        self.args = []
+        self.file_format = ""
+        self.spawn_duration = None  # Time to start the recording process, if one was started.
+        self.reused_session = False
+        self.exit_codes = []
+        self.capture_health = {}  # See CaptureSession.get_take_health().
+        self.telemetry = None
+
+    @property
+    def filepath(self):
+        """The sound file of the first audio input."""
+        return self.filepaths[0]
+
+    @property
+    def latency(self):
+        """Time from clicking record until the first sample was captured, in seconds."""
+        if self.time_first_sample is None:
+            return None
+        return self.time_first_sample - self.time_invoked
+
+    @property
+    def finalize_duration(self):
+        """Time from stopping until the sound file was complete, in seconds."""
+        if self.time_finalized is None:
+            return None
+        return self.time_finalized - self.time_stopped
+
+    def check_recording_started(self, now):
+        """Timestamp the first audio written by atunc, by looking at the file's size."""
+
+        try:
+            file_size = os.path.getsize(self.filepath)
+        except OSError:
+            return
+        # atunc writes a header of up to a page, then the audio data.
+        if file_size > 4096:
+            self.time_first_sample = now
+
+    def finalize(self):
+        """Finish writing the sound file. Runs on a background thread since it can be slow."""
+
+        try:
+            self.finish_recording()
+            if not self.is_cancelled:
+                self.analyze_recording()
+        except Exception:
+            log.exception(f"PushToTalk: failed to finish the recording '{self.filepath}'")
+        finally:
+            self.time_finalized = time.monotonic()
+            self.telemetry = self.get_telemetry()
+            log_take_telemetry(self.telemetry)
+            self.finalized.set()
+
+    def finish_recording(self):
+        """Close the sound file and stop the recording process, if it isn't kept armed."""
+
+        for writer in self.writers:
+            writer.close()
+            if isinstance(writer, EncoderWriter):
+                self.exit_codes.append(writer.process.returncode)
+        if self.session_to_close:
+            self.session_to_close.close()
+            self.exit_codes.append(self.session_to_close.returncode)
+        if self.recording_process:
+            self.recording_process.terminate()
+            # The maximum amount of time for us to wait for atunc to shut down in seconds.
+            maximum_shutdown_wait_time = 3
+            try:
+                # Wait for atunc to exit until we try to read the saved audio file.
+                self.recording_process.wait(maximum_shutdown_wait_time)
+            except TimeoutExpired:
+                log.warning(
+                    "Recording process did not gracefully shutdown within "
+                    f"{maximum_shutdown_wait_time} seconds."
+                )
+            else:
+                remove_recording_marker(self.filepath)
+            self.exit_codes.append(self.recording_process.returncode)
+
+    def get_telemetry(self):
+        """Measurements of how the take went, as a dict that can be saved as JSON."""
+
+        time_capture_start = self.time_audio_start or self.time_first_sample or self.time_invoked
+        capture_duration = max(self.time_stopped - time_capture_start, 0.0)
+        num_bytes = sum(get_file_size(filepath) for filepath in self.filepaths)
+
+        def rounded(duration):
+            return None if duration is None else round(duration, 4)
+
+        return {
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'files': [os.path.basename(filepath) for filepath in self.filepaths],
+            'backend': self.backend,
+            'args': [str(arg) for arg in self.args],
+            'format': self.file_format,
+            'devices': self.audio_devices,
+            'armed': self.reused_session,
+            'cancelled': self.is_cancelled,
+            'spawn': rounded(self.spawn_duration),
+            'first_sample': rounded(self.latency),
+            'capture': rounded(capture_duration),
+            'finalize': rounded(self.finalize_duration),
+            'bytes': num_bytes,
+            'write_rate': round(num_bytes / capture_duration) if capture_duration else None,
+            'exit_codes': self.exit_codes,
+            'overruns': self.capture_health.get('overruns'),
+            'missing_audio': rounded(self.capture_health.get('missing_audio')),
+            'read_gap': rounded(self.capture_health.get('read_gap')),
+        }
+
+    def analyze_recording(self):
+        """Analyze the finished sound file, to adjust the sound strip when it's added."""
+
+        if self.loudness_meters:
+            self.loudness = [
+                (meter.integrated_loudness, meter.true_peak_db) for meter in self.loudness_meters
+            ]
+        elif np and self.loudness_target is not None:
+            # atunc writes the file directly: measure it now, since it is needed.
+            try:
+                self.loudness = [measure_loudness(filepath) for filepath in self.filepaths]
+            except (OSError, ValueError) as err:
+                log.warning(f"PushToTalk: could not measure the loudness: {err}")
+
+        if self.trim_threshold is not None:
+            # Parallel strips are trimmed alike, to keep what is audible on any of them.
+            audible_ranges = []
+            try:
+                for filepath in self.filepaths:
+                    audible_range = find_audible_range(filepath, self.trim_threshold)
+                    if audible_range:
+                        audible_ranges.append(audible_range)
+            except (OSError, ValueError) as err:
+                log.warning(f"PushToTalk: could not find silence to trim: {err}")
+                self.trim_threshold = None
+                return
+            if audible_ranges:
+                self.audible_range = (
+                    min(start for start, end in audible_ranges),
+                    max(end for start, end in audible_ranges),
+                )
+
+    def sample_clocks(self, scene, now):
+        """Note the timeline frame against the audio captured so far. Called on each tick."""
+
+        if not self.capture_session:
+            return  # atunc doesn't report its progress.
+        audio_time = self.capture_session.get_take_position(now)
+        if audio_time is None:
+            return
+        # The frame shown is the one the playhead is in: on average, half way through it.
+        frame = getattr(scene, "frame_current_final", scene.frame_current) + 0.5
+        self.clock_fit.add(audio_time, frame)
+
+    def get_strip_frame_start(self, scene, sound_strip):
+        """Find where the sound strip should start to be in sync with the edit.
+
+        The recording starts with some latency after clicking record, which depends on the
+        hardware and OS. Place the first sample where the line fitted through the frames the
+        playhead was at during the take puts it. Failing that, at the frame the playhead was
+        at when it was captured. If that wasn't measured, align the end of the strip with
+        where it stopped.
+        """
+
+        fit = self.clock_fit.solve()
+        if fit and self.clock_fit.span >= CLOCK_FIT_MIN_SPAN:
+            frame_start, slope, residual = fit
+            if residual <= CLOCK_FIT_MAX_RESIDUAL:
+                fps = scene.render.fps / scene.render.fps_base
+                self.playback_speed = slope / fps
+                self.drift_frames = (slope - fps) * self.clock_fit.span
+                return round(frame_start)
+            log.debug(f"PushToTalk: playhead moved irregularly, {residual:.1f} frames off")
+
+        time_audio_start = self.time_audio_start or self.time_first_sample
+        if time_audio_start is None or self.time_frame_start is None:
+            log.warning("PushToTalk: could not measure the recording latency")
+            return self.frame_stopped - sound_strip.frame_final_duration
+
+        fps = scene.render.fps / scene.render.fps_base
+        delay_frames = (time_audio_start - self.time_frame_start) * fps
+        return self.frame_start + round(delay_frames)
+
+    def correct_drift(self, sound_strip):
+        """Play the sound strip at the speed the timeline played at while recording.
+
+        Only small differences are corrected, which come from the audio and playback clocks
+        drifting apart. Larger ones mean playback was struggling, which is better left as is.
+        """
+
+        if not self.correct_drift_speed or self.playback_speed is None:
+            return
+        if abs(self.drift_frames) < MIN_DRIFT_FRAMES:
+            return  # Within the accuracy of the measurement.
+        if abs(self.playback_speed - 1.0) > MAX_DRIFT_CORRECTION:
+            return
+        if hasattr(sound_strip, "pitch"):
+            # Pitch sets the playback speed of sound strips.
+            sound_strip.pitch = 1.0 / self.playback_speed
+
+    def trim_silence(self, scene, sound_strip):
+        """Hide leading and trailing silence of the sound strip, keeping the sound in sync.
+
+        The strip's offsets are set, so the file is untouched and the trim can be undone.
+        """
+
+        if self.trim_threshold is None:
+            return
+        trim_sound_strip(scene, sound_strip, self.audible_range, self.trim_padding)
+
+    def normalize_volume(self, sound_strip, input_index):
+        """Store the measured loudness in the sound strip, and set its volume to the target."""
+
+        if input_index >= len(self.loudness):
+            return
+        loudness, true_peak = self.loudness[input_index]
+        set_strip_loudness(sound_strip, loudness, true_peak, self.loudness_target, self.peak_limit)
+
+
+# Custom properties of sound strips with the loudness of their recording, in LUFS and dBTP.
+LOUDNESS_PROPERTY = "push_to_talk_loudness"
+TRUE_PEAK_PROPERTY = "push_to_talk_true_peak"
+
+
+def trim_sound_strip(scene, sound_strip, audible_range, padding):
+    """Set the sound strip's offsets to hide the audio outside of audible_range, in seconds."""
+
+    if audible_range is None:
+        return  # All silent: keep the take as is, for the user to see.
+
+    fps = scene.render.fps / scene.render.fps_base
+    duration = sound_strip.frame_duration
+    audible_start = max(audible_range[0] - padding, 0.0)
+    audible_end = audible_range[1] + padding
+    offset_start = math.floor(audible_start * fps)
+    offset_end = max(duration - math.ceil(audible_end * fps), 0)
+    if offset_start + offset_end >= duration:
+        return
+
+    sound_strip.frame_offset_start = offset_start
+    sound_strip.frame_offset_end = offset_end
+
+
+def set_strip_loudness(sound_strip, loudness, true_peak, target=None, peak_limit=0.0):
+    """Store the loudness of the sound strip's recording, and set its volume to the target."""
+
+    if loudness is None:
+        return  # All silent.
+
+    # Keep the measurement with the strip, to normalize it again without decoding.
+    sound_strip[LOUDNESS_PROPERTY] = loudness
+    sound_strip[TRUE_PEAK_PROPERTY] = true_peak
+    if target is not None:
+        sound_strip.volume = get_normalized_volume(loudness, true_peak, target, peak_limit)
+
+
+# Takes that stopped recording and are waiting for their sound file to be finished.
+pending_takes = []
+
+
+def add_take_strips(take):
+    """Replace the placeholder of a finalized take with its sound strips. Main thread only.
+
+    Return the sound strips added: none if the take was cancelled or its scene is gone.
+    """
+
+    if take in pending_takes:
+        pending_takes.remove(take)
+
+    log.debug(
+        f"PushToTalk: finished '{take.filepath}' in {take.finalize_duration * 1000:.0f}ms, "
+        f"{take.num_ticks} ticks took {take.tick_duration_total * 1000:.1f}ms"
+    )
+    SEQUENCER_OT_push_to_talk.last_take_finalize_duration = take.finalize_duration
+    recent_telemetry.append(take.telemetry)
+    update_telemetry_stats()
+    report_perf("take_finalize", take.finalize_duration, filepath=take.filepath)
+    report_perf("take_ticks", take.tick_duration_total, num_ticks=take.num_ticks)
+
+    scene = bpy.data.scenes.get(take.scene_name)
+    if not scene or not scene.sequence_editor:
+        log.warning(f"PushToTalk: scene to add '{take.filepath}' to is gone")
+        return []
+    sequence_ed = scene.sequence_editor
+
+    # Remove the placeholder strip, taking its channel in case the user moved it.
+    channel = take.channel
+    placeholder = sequence_ed.sequences.get(take.placeholder_name)
+    if placeholder:
+        channel = placeholder.channel
+        remove_strip_and_sound(sequence_ed.sequences, placeholder)
+
+    if take.is_cancelled:
+        return []
+
+    # Create new sound strips in the place of the placeholder strip, one per audio input on
+    # adjacent channels. They were captured together, so they all start at the same frame.
+    addon_prefs = bpy.context.preferences.addons[ADDON_ID].preferences
+    frame_start = None
+    sound_strips = []
+    for input_nr, filepath in enumerate(take.filepaths, 1):
+        name = addon_prefs.prefix
+        if len(take.filepaths) > 1:
+            name = f"{name}_mic{input_nr}"
+        sound_strip = sequence_ed.sequences.new_sound(
+            name, filepath, channel + input_nr - 1, take.frame_start
+        )
+        if frame_start is None:
+            frame_start = take.get_strip_frame_start(scene, sound_strip)
+            SEQUENCER_OT_push_to_talk.last_take_playback_speed = take.playback_speed
+        sound_strip.frame_start = frame_start
+        take.correct_drift(sound_strip)
+        take.trim_silence(scene, sound_strip)
+        take.normalize_volume(sound_strip, input_nr - 1)
+        sound_strips.append(sound_strip)
+
+    catalogue_take(take, scene, sound_strips)
+    return sound_strips
+
+
+# Recording Sessions ###############################################################################
+
+
+class RecordingError(RuntimeError):
+    """Recording could not start. The message is the reason, for the user."""
+
+
+def generate_take_filepaths(addon_prefs):
+    """Paths for the sound files of a new take, one per audio input, that aren't used yet.
+
+    Raise RecordingError if the sound files can't be saved.
+    """
+
+    # Resolve possible paths relative to the blend file to a system path
+    sounds_dir_sys = bpy.path.abspath(addon_prefs.sounds_dir)
+    if not os.path.isdir(sounds_dir_sys):
+        if bpy.path.abspath('//') == '':
+            raise RecordingError(
+                ".blend file needs to be saved so the sound clips go in the same directory"
+            )
+        raise RecordingError(
+            f"directory to save the sound clips does not exist: '{sounds_dir_sys}'"
+        )
+    if not os.access(sounds_dir_sys, os.W_OK):
+        raise RecordingError("the directory to save the sound clips is not writable")
+
+    timestamp = datetime.datetime.now().strftime("_%Y-%m-%d_%H-%M-%S")
+
+    # atunc on macOS only records WAV files.
+    extension = FILE_FORMATS[addon_prefs.file_format] if os_platform != 'Darwin' else ".wav"
+
+    # Each audio input gets its own file, suffixed by the number of the input.
+    num_inputs = len(get_audio_input_devices(addon_prefs)) if os_platform != 'Darwin' else 1
+    suffixes = [f"_mic{nr}" for nr in range(1, num_inputs + 1)] if num_inputs > 1 else [""]
+
+    # Takes can follow each other within the same second. Number them to avoid collisions.
+    basename = f"{sounds_dir_sys}{addon_prefs.prefix}{timestamp}"
+    filepaths = [f"{basename}{suffix}{extension}" for suffix in suffixes]
+    take_nr = 1
+    while any(os.path.exists(filepath) for filepath in filepaths):
+        take_nr += 1
+        filepaths = [f"{basename}_{take_nr}{suffix}{extension}" for suffix in suffixes]
+    return filepaths
+
+
+def start_take_recording(take, addon_prefs, scene, on_audio=None):
+    """Start recording the take, with atunc on macOS and an ffmpeg capture session otherwise.
+
+    on_audio is called from another thread once the first audio is captured, with ffmpeg.
+    Raise RecordingError if recording could not start.
+    """
+
+    audio_device = addon_prefs.audio_input_device
+
+    if os_platform == 'Darwin':
+        take.audio_devices = [audio_device]
+        take.backend = "atunc"
+        take.file_format = 'WAV'
+        args = [atunc_exe_path, "--device-id", audio_device, "--output-path", take.filepath]
+        add_recording_marker(take.filepath)
+        time_start = time.monotonic()
+        try:
+            take.recording_process = Popen(args)
+        except OSError as err:
+            raise RecordingError(str(err)) from err
+        take.spawn_duration = time.monotonic() - time_start
+        take.args = args
+        log.debug("PushToTalk: Started audio recording process")
+        log.debug(f"PushToTalk: {args}")
+        return
+
+    # On Windows and Linux, capture with ffmpeg. Reuse the armed audio devices if any.
+    take.audio_devices = list(get_audio_input_devices(addon_prefs))
+    if not take.audio_devices:
+        raise RecordingError("no audio device found")
+    # Audio from before clicking record is only there if the device was kept armed.
+    pre_roll = addon_prefs.pre_roll if addon_prefs.keep_microphone_armed else 0.0
+    take.backend = "ffmpeg"
+    take.file_format = addon_prefs.file_format
+    armed_session = capture_session
+    try:
+        time_start = time.monotonic()
+        take.capture_session = get_capture_session(
+            take.audio_devices, get_capture_format(addon_prefs, scene), pre_roll
+        )
+        take.reused_session = take.capture_session is armed_session
+        if not take.reused_session:
+            take.spawn_duration = time.monotonic() - time_start
+        take.args = take.capture_session.args
+        take.capture_session.start_take(
+            take.filepaths,
+            get_codec_args(addon_prefs),
+            buffer_size=addon_prefs.write_buffer_size * 1024,
+            # Preferences saved before it had a maximum may be above it.
+            sync_interval=min(addon_prefs.sync_interval, MAX_SYNC_INTERVAL),
+            pre_roll=pre_roll,
+            on_audio=on_audio,
+        )
+    except OSError as err:
+        close_capture_session()
+        raise RecordingError(str(err)) from err
+
+
+def stop_take_recording(take, addon_prefs, scene):
+    """Stop recording the take, leaving its sound files to be finished by Take.finalize().
+
+    The take is set up to be processed with the current preferences.
+    """
+
+    take.time_stopped = time.monotonic()
+    take.frame_stopped = scene.frame_current if scene else take.frame_start
+
+    if addon_prefs.trim_silence:
+        take.trim_threshold = 10 ** (addon_prefs.trim_threshold / 20)
+        take.trim_padding = addon_prefs.trim_padding
+    take.correct_drift_speed = addon_prefs.correct_drift
+    if addon_prefs.normalize_loudness:
+        take.loudness_target = addon_prefs.loudness_target
+        take.peak_limit = addon_prefs.loudness_peak_limit
+
+    # Stop writing the take. Keep the audio device open for the next take if the user wants.
+    session = take.capture_session
+    if session:
+        take.time_first_sample = session.first_live_sample_time
+        take.time_audio_start = session.first_sample_time
+        take.capture_health = session.get_take_health(take.time_stopped)
+        take.writers = session.stop_take()
+        take.duration = session.take_num_frames / session.sample_rate
+        take.loudness_meters = session.loudness_meters
+        if addon_prefs.keep_microphone_armed and session.is_alive:
+            if not bpy.app.timers.is_registered(close_idle_capture_session):
+                bpy.app.timers.register(
+                    close_idle_capture_session,
+                    first_interval=addon_prefs.armed_idle_timeout * 60,
+                )
+        else:
+            take.session_to_close = detach_capture_session()
+    elif take.time_first_sample is not None:
+        take.duration = take.time_stopped - take.time_first_sample
+
+    if take.latency is not None:
+        log.debug(f"PushToTalk: latency {take.latency * 1000:.0f}ms to the first sample")
+
+
+class TakeResult:
+    """What a take recorded, once its sound strips were added. See RecordingSession."""
+
+    def __init__(self, take, sound_strips):
+        self.filepaths = list(take.filepaths)
+        self.scene_name = take.scene_name
+        # Names of the sound strips in the scene's sequencer, one per sound file, if any.
+        self.strip_names = [sound_strip.name for sound_strip in sound_strips]
+        self.frame_start = sound_strips[0].frame_start if sound_strips else None
+        self.is_cancelled = take.is_cancelled
+        # In seconds: the audio recorded, from starting until the first sample was captured,
+        # and from stopping until the sound files were finished.
+        self.duration = take.duration
+        self.latency = take.latency
+        self.finalize_duration = take.finalize_duration
+        self.telemetry = take.telemetry  # See Take.get_telemetry().
+
+    def __repr__(self):
+        return f"<TakeResult {self.filepaths} at frame {self.frame_start}>"
+
+
+class RecordingSession:
+    """Records a take into a scene: what the Start Recording button does, for scripts too.
+
+    The steps can be awaited from coroutines run on the add-on's asyncio event loop, which
+    Blender steps from a timer on the main thread, so they can use bpy. For example:
+
+        async def record_lines(scene, durations):
+            results = []
+            for duration in durations:
+                session = RecordingSession(scene)
+                await session.start()
+                await asyncio.sleep(duration)
+                await session.stop()
+                results.append(await session.finalize())
+            return results
+
+        task = run_coroutine(record_lines(bpy.context.scene, [4.0, 2.5]))
+
+    Recording runs while the timeline plays, which the caller starts. The sound files are
+    written, finished and analyzed on background threads, and waited for without polling.
+    Only one session records at a time; the next can start while the previous one finishes.
+    """
+
+    def __init__(self, scene, channel=1):
+        self.scene_name = scene.name
+        self.channel = channel
+        self.take = None
+        self._started = None  # Resolves to whether audio started coming in.
+        self._finalizing = None  # Task adding the sound strips, once stopped.
+        self._ticker = None
+
+    @property
+    def is_recording(self):
+        return recording_session is self
+
+    def begin(self):
+        """Start recording right away, without waiting for the audio. Return the Take.
+
+        Raise RecordingError if recording could not start.
+        """
+
+        global recording_session
+
+        time_invoked = time.monotonic()
+        if recording_session is not None:
+            raise RecordingError("another take is being recorded")
+        scene = bpy.data.scenes[self.scene_name]
+        addon_prefs = bpy.context.preferences.addons[ADDON_ID].preferences
+
+        take = Take(generate_take_filepaths(addon_prefs), scene)
+        take.time_invoked = time_invoked
+        take.channel = self.channel
+        loop = get_event_loop()
+        started = loop.create_future()
+        start_take_recording(
+            take, addon_prefs, scene, on_audio=lambda: resolve_future(started, True)
+        )
+        take.time_frame_start = time.monotonic()
+
+        self.take = take
+        self._started = started
+        recording_session = self
+        self._ticker = run_coroutine(self._tick())
+        return take
+
+    async def start(self):
+        """Start recording and wait until the first audio was captured. Return the Take.
+
+        Raise RecordingError if recording could not start, or the audio device gave nothing.
+        """
+
+        take = self.begin()
+        if not await asyncio.shield(self._started):
+            raise RecordingError("the audio device stopped before sending any audio")
+        if take.capture_session:
+            take.time_first_sample = take.capture_session.first_live_sample_time
+        return take
+
+    async def _tick(self):
+        """Sample the clocks once per played frame while recording, see Take.sample_clocks()."""
+
+        take = self.take
+        while self.is_recording:
+            scene = bpy.data.scenes.get(self.scene_name)
+            if not scene:
+                break
+            now = time.monotonic()
+            take.sample_clocks(scene, now)
+            if not self._started.done():
+                if take.recording_process:
+                    take.check_recording_started(now)
+                    if take.time_first_sample is not None:
+                        self._started.set_result(True)
+                elif not take.capture_session.is_alive:
+                    self._started.set_result(False)
+            await asyncio.sleep(get_tick_interval(scene))
+
+    def end(self, cancel=False):
+        """Stop recording right away and finish the take in the background.
+
+        Return the asyncio.Task that adds the sound strips and gives the TakeResult.
+        """
+
+        global recording_session
+
+        if self._finalizing:
+            return self._finalizing
+        take = self.take
+        take.is_cancelled = take.is_cancelled or cancel
+        addon_prefs = bpy.context.preferences.addons[ADDON_ID].preferences
+        stop_take_recording(take, addon_prefs, bpy.data.scenes.get(self.scene_name))
+        recording_session = None
+        self._ticker.cancel()
+        if not self._started.done():
+            self._started.set_result(False)
+
+        # Finishing the files can take a while with ffmpeg/atunc or a slow disk: leave it to a
+        # thread, so that the UI doesn't hang, and have it signal the event loop once done.
+        finalized = get_event_loop().create_future()
+        pending_takes.append(take)
+
+        def finalize():
+            take.finalize()
+            resolve_future(finalized, None)
+
+        threading.Thread(target=finalize, name="push_to_talk_finalize", daemon=True).start()
+        self._finalizing = run_coroutine(self._add_strips(finalized))
+        return self._finalizing
+
+    async def stop(self, cancel=False):
+        """Stop recording. The take is finished in the background, see finalize()."""
+
+        self.end(cancel)
+
+    async def _add_strips(self, finalized):
+        await finalized
+        return TakeResult(self.take, add_take_strips(self.take))
+
+    async def finalize(self):
+        """Wait until the take's sound strips were added after stopping. Return a TakeResult."""
+
+        if not self._finalizing:
+            raise RuntimeError("the session was not stopped")
+        return await asyncio.shield(self._finalizing)
+
+
+# The session recording right now, if any.
+recording_session = None
+
+# The asyncio event loop of recording sessions. It runs on the main thread, a step per tick of
+# step_event_loop(), so that the coroutines can use bpy between their awaits.
+event_loop = None
+# Rounds of callbacks run per step: enough for a due timer to resume the task awaiting it, and
+# for a result to be passed on through a few awaits, while a busy coroutine can't hold up the UI.
+EVENT_LOOP_ROUNDS = 4
+# When the event loop should be stepped next (time.monotonic()), if earlier than the next tick.
+# See request_event_loop_wakeup().
+event_loop_wakeup = None
+
+
+def get_event_loop():
+    global event_loop
+
+    if event_loop is None or event_loop.is_closed():
+        event_loop = asyncio.new_event_loop()
+    return event_loop
+
+
+def run_coroutine(coroutine):
+    """Run the coroutine on the add-on's event loop, from the main thread. Return its Task."""
+
+    task = get_event_loop().create_task(coroutine)
+    if not bpy.app.timers.is_registered(step_event_loop):
+        bpy.app.timers.register(step_event_loop, first_interval=0, persistent=True)
+    return task
+
+
+def request_event_loop_wakeup(delay=0.0):
+    """Have the event loop stepped within delay seconds, if that is before its next tick.
+
+    For callbacks due sooner than once per played frame, e.g. a call_later() with a short delay.
+    Requests made while the loop waits for its next step, e.g. from another thread, get it
+    stepped again right after that step, for what their results lead to.
+    """
+
+    global event_loop_wakeup
+
+    wakeup = time.monotonic() + delay
+    # A plain read and write, from any thread: a request lost to a race waits for the next tick.
+    if event_loop_wakeup is None or wakeup < event_loop_wakeup:
+        event_loop_wakeup = wakeup
+
+
+def step_event_loop():
+    """Run the callbacks of the event loop that are ready, while there are tasks.
+
+    Steps once per played frame, see get_tick_interval(), or sooner when a wakeup was requested
+    with request_event_loop_wakeup().
+    """
+
+    global event_loop_wakeup
+
+    loop = event_loop
+    if loop is None or loop.is_closed():
+        return None
+    start_time = time.perf_counter()
+    for _ in range(EVENT_LOOP_ROUNDS):
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+    report_perf("event_loop_step", time.perf_counter() - start_time)
+    if not asyncio.all_tasks(loop):
+        return None  # Unregister the timer.
+
+    scene = bpy.context.scene
+    interval = get_tick_interval(scene) if scene else 0.1
+    wakeup, event_loop_wakeup = event_loop_wakeup, None
+    if wakeup is not None:
+        delay = wakeup - time.monotonic()
+        if delay > 0.0:
+            event_loop_wakeup = wakeup  # Not due yet.
+        interval = min(interval, max(delay, 0.0))
+    return interval
+
+
+def resolve_future(future, result):
+    """Set the result of a future of the event loop, from any thread, unless it's done."""
+
+    def set_result():
+        if not future.done():
+            future.set_result(result)
+
+    try:
+        future.get_loop().call_soon_threadsafe(set_result)
+    except RuntimeError:
+        return  # The event loop was closed, when unregistering.
+    request_event_loop_wakeup()
+
+
+def close_event_loop():
+    """Cancel the tasks of the event loop and close it."""
+
+    global event_loop
+
+    if bpy.app.timers.is_registered(step_event_loop):
+        bpy.app.timers.unregister(step_event_loop)
+    loop, event_loop = event_loop, None
+    if loop is None or loop.is_closed():
+        return
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+
+# Reprocessing #####################################################################################
+
+
+def reprocess_sound_file(filepath, codec_args=None, extension="", trim_threshold=None,
+                         measure=False):
+    """Convert and analyze a recorded sound file, for SEQUENCER_OT_push_to_talk_reprocess.
+
+    Run on worker threads: conversions run in ffmpeg processes and NumPy releases the GIL on
+    large arrays, so several files are processed at once on all cores.
+    The file is converted to extension with codec_args, next to the original which is kept.
+    Return a dict with the 'filepath' to use, and its 'audible_range' above trim_threshold and
+    'loudness' (integrated, true peak) if asked for.
+    """
+
+    result = {'filepath': filepath}
+    base, current_extension = os.path.splitext(filepath)
+    if extension and current_extension.lower() != extension:
+        converted_filepath = base + extension
+        if not os.path.exists(converted_filepath):  # Else it was converted already.
+            temp_filepath = f"{base}.converting{extension}"
+            args = [
+                ffmpeg_exe_path, "-hide_banner", "-loglevel", "error", "-nostdin",
+                "-i", filepath, "-vn", *(codec_args or ["-c:a", "pcm_s16le"]),
+                "-y", temp_filepath,
+            ]
+            with Popen(args) as proc:
+                if proc.wait() != 0:
+                    if os.path.exists(temp_filepath):
+                        os.remove(temp_filepath)
+                    raise ValueError(f"ffmpeg could not convert '{filepath}'")
+            os.replace(temp_filepath, converted_filepath)
+        result['filepath'] = converted_filepath
+
+    if trim_threshold is not None:
+        result['audible_range'] = find_audible_range(filepath, trim_threshold)
+    if measure:
+        result['loudness'] = measure_loudness(filepath)
+    return result
+
+
+# Live Sound Strips ################################################################################
+
+# Seconds between refreshes of live sound strips: a fraction of the audio recorded so far within
+# limits, so that long takes aren't refreshed ever more often relative to how much they grow.
+LIVE_STRIP_MIN_INTERVAL = 1.0
+LIVE_STRIP_MAX_INTERVAL = 10.0
+LIVE_STRIP_INTERVAL_FRACTION = 0.1
+# Number of channels of the sequencer.
+MAX_CHANNELS = 128
+
+
+class LiveSoundStrip:
+    """A sound strip of the take being recorded, growing as the audio is written.
+
+    It takes the place of the placeholder strip, so the take can be scrubbed and listened to
+    while still recording. Only for takes captured to WAV files by a CaptureSession, whose
+    headers can be patched with the size written so far. The first microphone's is shown.
+
+    Refreshes are throttled: the capture's reader thread is asked to sync the files, and once
+    it did, the strip is replaced by one of the synced file. Blender only reads the file's
+    header to add the strip and streams the audio when played, so nothing is decoded.
+    """
+
+    def __init__(self, take):
+        self.take = take
+        self.sound = None  # Sound data-block of the file, shared by the strips shown.
+        self.num_frames = 0  # Sample frames of audio in the strip.
+        self._next_refresh = 0.0
+        self._sync_requested = False
+
+    def update(self, scene, placeholder, now):
+        """Refresh the strip, if it's time. Main thread only.
+
+        Return the sound strip that replaced the placeholder, or None if it wasn't replaced.
+        """
+
+        session = self.take.capture_session
+        if not session or now < self._next_refresh:
+            return None
+        if not self._sync_requested:
+            session.request_sync()
+            self._sync_requested = True
+            return None
+        num_frames = session.take_synced_frames
+        if num_frames <= self.num_frames:
+            return None  # Not synced yet, or no new audio came in.
+
+        self._sync_requested = False
+        duration = num_frames / session.sample_rate
+        interval = duration * LIVE_STRIP_INTERVAL_FRACTION
+        self._next_refresh = now + min(
+            max(interval, LIVE_STRIP_MIN_INTERVAL), LIVE_STRIP_MAX_INTERVAL
+        )
+        fps = scene.render.fps / scene.render.fps_base
+        if duration * fps < 1.0:
+            return None  # Too short to be a strip.
+
+        time_start = time.perf_counter()
+        sound_strip = self.replace(scene, placeholder, duration)
+        report_perf("live_strip_refresh", time.perf_counter() - time_start, take_duration=duration)
+        if sound_strip:
+            self.num_frames = num_frames
+        return sound_strip
+
+    def replace(self, scene, placeholder, duration):
+        """Replace the placeholder with a sound strip of the take's file as it is now.
+
+        The strip is added on a free channel above the placeholder, then moved to its channel,
+        so Blender never shifts it or other strips out of the way. The strips shown all use
+        the same sound data-block, reloaded for each.
+        """
+
+        # Place it where the take started, give or take playback drift, which is only measured
+        # when the take is finished.
+        take = self.take
+        fps = scene.render.fps / scene.render.fps_base
+        frame_start = take.frame_start
+        first_sample_time = take.capture_session.first_sample_time
+        if first_sample_time is not None and take.time_frame_start is not None:
+            frame_start += round((first_sample_time - take.time_frame_start) * fps)
+        frame_end = frame_start + math.ceil(duration * fps)
+
+        sequences = scene.sequence_editor.sequences
+        name, channel = placeholder.name, placeholder.channel
+        occupied = {
+            strip.channel
+            for strip in sequences
+            if strip != placeholder
+            and strip.frame_final_start < frame_end
+            and strip.frame_final_end > frame_start
+        }
+        free_channel = channel + 1
+        while free_channel in occupied:
+            free_channel += 1
+        if free_channel > MAX_CHANNELS:
+            return None
+
+        # Add the new strip first, so that the placeholder is kept if it can't be added.
+        try:
+            sound_strip = sequences.new_sound(name, take.filepath, free_channel, frame_start)
+        except RuntimeError as err:
+            log.warning(f"PushToTalk: could not show '{take.filepath}' while recording: {err}")
+            return None
+        if self.sound is None:
+            self.sound = sound_strip.sound
+        else:
+            # Its own sound was only needed to measure the file's length.
+            new_sound, sound_strip.sound = sound_strip.sound, self.sound
+            if not new_sound.users:
+                bpy.data.sounds.remove(new_sound)
+            self.sound.filepath = self.sound.filepath  # Reloads it, with the new audio.
+        remove_strip_and_sound(sequences, placeholder)
+        # Where the take started before the placeholder, its channel may be taken there.
+        if channel not in occupied:
+            sound_strip.channel = channel
+        sound_strip.name = name
+        return sound_strip
+
+
+def remove_strip_and_sound(sequences, strip):
+    """Remove a strip, and its sound data-block if nothing else uses it."""
+
+    sound = strip.sound if strip.type == 'SOUND' else None
+    sequences.remove(strip)
+    if sound and not sound.users:
+        bpy.data.sounds.remove(sound)
+
+
+# Operator #########################################################################################
+
+
+class SEQUENCER_OT_push_to_talk(Operator):
+    bl_idname = "sequencer.push_to_talk"
+    bl_label = "Start Recording"
+    bl_description = "Add a sound strip with audio recorded from the microphone"
+    bl_options = {'UNDO', 'REGISTER'}
+
+    # Runtime state shared between instances of this operator
+    should_stop = False
+    is_running = False
+    active_take = None
+    visual_feedback_strip = None
+    live_strip = None  # LiveSoundStrip replacing the visual feedback strip, if enabled.
+    strip_channel = 1
+    # Measured time from clicking record until the first sample was captured, in seconds.
+    last_take_latency = None
+    # Measured time from clicking stop until the sound file was complete, in seconds.
+    last_take_finalize_duration = None
+    # Measured timeline playback speed relative to the audio clock, see Take.clock_fit.
+    last_take_playback_speed = None
+    # Latest (peak, rms) input levels while recording, or None if not available.
+    input_levels = None
+    # When the input was last heard above the silence threshold (time.monotonic()).
+    time_last_signal = 0.0
+    # Why the take being recorded lost audio, if it did. See CaptureSession.get_take_warning().
+    capture_warning = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.session = None
+        self.take = None
+        self._timer = None
+        self.was_playing = None
+
+    def add_visual_feedback_strip(self, context):
+        """Add a color strip to mark the current progress of the recording."""
+
+        scene = context.scene
+        self.take.frame_start = scene.frame_current
+
+        strip = scene.sequence_editor.sequences.new_effect(
+            name="Recording...",
+            type='COLOR',
+            channel=1,
+            frame_start=self.take.frame_start,
+            frame_end=self.take.frame_start + 1,
+        )
+        strip.color = (0.5607842206954956, 0.21560697257518768, 0.1903851181268692)
+        strip.blend_alpha = 0.0
 
-            # Arguments for ffmpeg to use a small blocksize and save the output to disk ASAP.
-            file_block_size = "-blocksize 2048 -flush_packets 1"
+        SEQUENCER_OT_push_to_talk.visual_feedback_strip = strip
 
-            # Run the ffmpeg command.
-            ffmpeg_command += f' {file_block_size} "{self.filepath}"'
-            args = [ffmpeg_exe_path] + shlex.split(ffmpeg_command)
-            self.recording_process = Popen(args)
+    @classmethod
+    def poll(cls, context):
+        # Called on every redraw of the header: only read what was checked beforehand.
+        setup_problem, device_problem = get_recording_problems()
+        if setup_problem or device_problem:
+            cls.poll_message_set(setup_problem or device_problem)
+            return False
 
-        log.debug("PushToTalk: Started audio recording process")
-        log.debug(f"PushToTalk: {args}")
-        return True
+        # This operator is available only in the sequencer area of the sequence editor.
+        return context.space_data.type == 'SEQUENCE_EDITOR' and (
+            context.space_data.view_type == 'SEQUENCER'
+            or context.space_data.view_type == 'SEQUENCER_PREVIEW'
+        )
 
     def invoke(self, context, event):
         """Called when this operator is starting."""
 
         log.debug("PushToTalk: invoke")
+        time_invoked = time.monotonic()
 
         # If this operator is already running modal, this second invocation is
         # the toggle to stop it. Set a variable that the first modal operator
@@ -436,26 +3817,36 @@ class SEQUENCER_OT_push_to_talk(Operator):
             return {'FINISHED'}
 
         SEQUENCER_OT_push_to_talk.is_running = True
+        SEQUENCER_OT_push_to_talk.input_levels = None
+        SEQUENCER_OT_push_to_talk.time_last_signal = time_invoked
+        SEQUENCER_OT_push_to_talk.capture_warning = None
 
-        # Generate the name to save the audio file.
-        if not self.generate_filename(context):
-            SEQUENCER_OT_push_to_talk.is_running = False
-            return {'CANCELLED'}
-
-        if not self.start_recording(context):
+        self.session = RecordingSession(context.scene)
+        try:
+            self.take = self.session.begin()
+        except RecordingError as err:
+            self.report({'ERROR'}, f"Could not record audio: {err}")
             SEQUENCER_OT_push_to_talk.is_running = False
             return {'CANCELLED'}
+        self.take.time_invoked = time_invoked
 
         self.add_visual_feedback_strip(context)
+        SEQUENCER_OT_push_to_talk.active_take = self.take
+        addon_prefs = context.preferences.addons[ADDON_ID].preferences
+        if addon_prefs.live_sound_strip and self.take.capture_session:
+            if self.take.file_format == 'WAV':
+                SEQUENCER_OT_push_to_talk.live_strip = LiveSoundStrip(self.take)
 
         # Ensure that the timeline is playing
         self.was_playing = context.screen.is_animation_playing
         if not self.was_playing:
             bpy.ops.screen.animation_play()
+        self.take.time_frame_start = time.monotonic()
 
-        # Start this operator as modal
+        # Start this operator as modal, checking for changes once per played frame.
+        schedule_update_on_main_thread()
         wm = context.window_manager
-        self._timer = wm.event_timer_add(0.02, window=context.window)
+        self._timer = wm.event_timer_add(get_tick_interval(context.scene), window=context.window)
         wm.modal_handler_add(self)
         return {'RUNNING_MODAL'}
 
@@ -487,53 +3878,52 @@ class SEQUENCER_OT_push_to_talk(Operator):
             color_strip = SEQUENCER_OT_push_to_talk.visual_feedback_strip
             if not color_strip:
                 return self.cancel(context)
+            # Stop if the audio device went away, keeping what was recorded so far.
+            if self.take.capture_session and not self.take.capture_session.is_alive:
+                return self.execute(context)
 
         # Don't consume the input, otherwise it is impossible to click the stop button.
         return {'PASS_THROUGH'}
 
-    def on_cancel_or_finish(self, context):
-        """Called when this operator is finishing (confirm) or got canceled."""
+    def on_cancel_or_finish(self, context, cancel=False):
+        """Called when this operator is finishing (confirm) or got canceled.
+
+        Stop recording right away and leave finishing the sound file to the recording session,
+        so that the UI doesn't hang while waiting for ffmpeg/atunc or a slow disk.
+        """
+
+        take = self.take
 
         # Unregister from the periodic modal calls.
         if self._timer:
             wm = context.window_manager
             wm.event_timer_remove(self._timer)
 
+        # Keep the visual feedback strip as a placeholder until the sound strip replaces it.
+        color_strip = SEQUENCER_OT_push_to_talk.visual_feedback_strip
+        SEQUENCER_OT_push_to_talk.visual_feedback_strip = None
+        if color_strip and color_strip.name:
+            take.channel = color_strip.channel
+            color_strip.name = "Saving Recording..."
+            take.placeholder_name = color_strip.name
+
+        self.session.end(cancel)
+        SEQUENCER_OT_push_to_talk.last_take_latency = take.latency
+
         # Restore the play state (stop it if it wasn't running).
-        # Do this before terminating the recording so that the new sound strip doesn't look shorter
-        # than the playhead position which would continue while waiting for ffmpeg/atunc to finish.
         if not self.was_playing:
             bpy.ops.screen.animation_play()
 
-        # Finish the sound recording process.
-        if self.recording_process:
-            self.recording_process.terminate()
-            # The maximum amount of time for us to wait for ffmpeg/atunc to shut down in seconds.
-            maximum_shutdown_wait_time = 3
-            try:
-                # Wait for ffmpeg/atunc to exit until we try to read the saved audio file.
-                self.recording_process.wait(maximum_shutdown_wait_time)
-            except TimeoutExpired:
-                log.warning(
-                    "Recording process did not gracefully shutdown within "
-                    f"{maximum_shutdown_wait_time} seconds."
-                )
-
-        # Remove the temporary visual feedback strip.
-        color_strip = SEQUENCER_OT_push_to_talk.visual_feedback_strip
-        if color_strip and color_strip.name:
-            SEQUENCER_OT_push_to_talk.visual_feedback_strip = None
-            sequence_ed = context.scene.sequence_editor
-            sequence_ed.sequences.remove(color_strip)
-
         # Update this operator's state.
+        SEQUENCER_OT_push_to_talk.active_take = None
+        SEQUENCER_OT_push_to_talk.live_strip = None
         SEQUENCER_OT_push_to_talk.is_running = False
         SEQUENCER_OT_push_to_talk.should_stop = False
 
     def execute(self, context):
         """Called to finish this operator's action.
 
-        Create the sound strip with the finished audio recording.
+        The sound strip with the finished audio recording is created once the file is complete.
         """
 
         log.debug("PushToTalk: execute")
@@ -541,16 +3931,6 @@ class SEQUENCER_OT_push_to_talk(Operator):
         # Cleanup execution state
         self.on_cancel_or_finish(context)
 
-        sequence_ed = context.scene.sequence_editor
-        addon_prefs = context.preferences.addons[ADDON_ID].preferences
-
-        # Create a new sound strip in the place of the dummy strip.
-        name = addon_prefs.prefix
-        sound_strip = sequence_ed.sequences.new_sound(
-            name, self.filepath, self.strip_channel, self.frame_start
-        )
-        sound_strip.frame_start = context.scene.frame_current - sound_strip.frame_final_duration
-
         return {'FINISHED'}
 
     def cancel(self, context):
@@ -559,48 +3939,508 @@ class SEQUENCER_OT_push_to_talk(Operator):
         log.debug("PushToTalk: cancel")
 
         # Cleanup execution state
-        self.on_cancel_or_finish(context)
+        self.on_cancel_or_finish(context, cancel=True)
 
         # If the timeline wasn't playing, restore the playhead to the original position.
         if not self.was_playing:
             scene = context.scene
-            scene.frame_current = self.frame_start
+            scene.frame_current = self.take.frame_start
 
         return {'CANCELLED'}
 
     @classmethod
     def update_on_main_thread(cls):
-        """Ticks even when the operator is not running. Needed to safely access the color strip."""
+        """Ticks while recording. Needed to safely access the color strip.
+
+        The timer is registered only while there is something to do, see
+        schedule_update_on_main_thread(), and ticks once per played frame.
+        """
+
+        time_start = time.perf_counter()
+        keep_ticking = cls.update_recording_state()
+        tick_duration = time.perf_counter() - time_start
 
-        delta_s = 0.05  # Update frequency
+        if cls.active_take:
+            cls.active_take.num_ticks += 1
+            cls.active_take.tick_duration_total += tick_duration
+        report_perf("tick", tick_duration)
+
+        if not keep_ticking:
+            return None  # Unregister the timer.
+        return get_tick_interval(bpy.context.scene)
+
+    @classmethod
+    def update_recording_state(cls) -> bool:
+        """Update the recording's visual feedback. Return whether there is more to update."""
 
         color_strip = SEQUENCER_OT_push_to_talk.visual_feedback_strip
 
-        # If the color_strip is None, the operator isn't running. Nothing to do.
+        # If the color_strip is None, the operator isn't running.
         if not color_strip:
-            return delta_s
+            return False
 
         # Check if the color strip got deleted by Blender. Signal the operator to stop.
         if not color_strip.name:
             # Cleanly set our reference to None, which can be checked in modal().
             # Accessing the strip directly in modal() is not thread safe.
             SEQUENCER_OT_push_to_talk.visual_feedback_strip = None
-            return delta_s
+            return True
 
-        # Increase the visual feedback strip's size.
-        color_strip.frame_final_end = bpy.context.scene.frame_current
+        # Increase the visual feedback strip's size. A live sound strip is as long as its audio.
+        scene = bpy.context.scene
+        if cls.live_strip:
+            sound_strip = cls.live_strip.update(scene, color_strip, time.monotonic())
+            if sound_strip:
+                SEQUENCER_OT_push_to_talk.visual_feedback_strip = color_strip = sound_strip
+        if color_strip.type != 'SOUND':
+            color_strip.frame_final_end = scene.frame_current
 
         # Keep track of the current channel for the recorded strip.
         # In case the color strip gets deleted, we have up-to-date info.
         SEQUENCER_OT_push_to_talk.strip_channel = color_strip.channel
 
-        return delta_s
+        # Update the input level meter.
+        if capture_session and capture_session.is_recording:
+            now = time.monotonic()
+            levels = capture_session.level_meter.read()
+            if levels[0] > SILENCE_LEVEL:
+                SEQUENCER_OT_push_to_talk.time_last_signal = now
+            SEQUENCER_OT_push_to_talk.input_levels = levels
+            warning = capture_session.get_take_warning(now)
+            if warning and not SEQUENCER_OT_push_to_talk.capture_warning:
+                log.warning(f"PushToTalk: {warning}")
+            SEQUENCER_OT_push_to_talk.capture_warning = warning
+            for window in bpy.context.window_manager.windows:
+                for area in window.screen.areas:
+                    if area.type == 'SEQUENCE_EDITOR':
+                        area.tag_redraw()
+
+        return True
+
+
+def get_tick_interval(scene):
+    """Time between updates while recording, in seconds: once per played frame."""
+
+    fps = scene.render.fps / scene.render.fps_base
+    return min(max(1.0 / fps, 1.0 / 60.0), 0.1)
+
+
+def schedule_update_on_main_thread():
+    """Start ticking SEQUENCER_OT_push_to_talk.update_on_main_thread, if it isn't already."""
+
+    if not bpy.app.timers.is_registered(SEQUENCER_OT_push_to_talk.update_on_main_thread):
+        bpy.app.timers.register(
+            SEQUENCER_OT_push_to_talk.update_on_main_thread, first_interval=0, persistent=True
+        )  # Keep timer running across file loads
+
+
+class SEQUENCER_OT_push_to_talk_normalize(Operator):
+    bl_idname = "sequencer.push_to_talk_normalize"
+    bl_label = "Normalize Loudness"
+    bl_description = (
+        "Set the volume of the selected recordings to play at the target loudness. "
+        "Uses the loudness measured when recording"
+    )
+    bl_options = {'UNDO', 'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.scene.sequence_editor and context.selected_editable_sequences)
+
+    def execute(self, context):
+        addon_prefs = context.preferences.addons[ADDON_ID].preferences
+
+        num_normalized = 0
+        for strip in context.selected_editable_sequences:
+            loudness = strip.get(LOUDNESS_PROPERTY)
+            if strip.type != 'SOUND' or loudness is None:
+                continue
+            strip.volume = get_normalized_volume(
+                loudness,
+                strip.get(TRUE_PEAK_PROPERTY, 0.0),
+                addon_prefs.loudness_target,
+                addon_prefs.loudness_peak_limit,
+            )
+            num_normalized += 1
+
+        if not num_normalized:
+            self.report({'WARNING'}, "No selected sound strips with a measured loudness")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Normalized {num_normalized} sound strip(s)")
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_push_to_talk_clean_up(Operator):
+    bl_idname = "sequencer.push_to_talk_clean_up"
+    bl_label = "Clean Up Unused Takes"
+    bl_description = (
+        "Delete the recorded takes that no strip uses, in this blend file or the others next "
+        "to it or in the sounds directory"
+    )
+    bl_options = {'REGISTER'}
+
+    # Takes found unused on invoke, to be deleted on confirmation.
+    catalogue = None
+    unused_takes = []
+    directories_checked = []
+    blend_filepaths_checked = []
+
+    def invoke(self, context, event):
+        addon_prefs = context.preferences.addons[ADDON_ID].preferences
+        sounds_dir_sys = bpy.path.abspath(addon_prefs.sounds_dir)
+        if not os.path.isdir(sounds_dir_sys):
+            self.report({'ERROR'}, f"The sounds directory does not exist: '{sounds_dir_sys}'")
+            return {'CANCELLED'}
+
+        cls = SEQUENCER_OT_push_to_talk_clean_up
+        cls.catalogue = get_take_catalogue(sounds_dir_sys)
+        try:
+            cls.unused_takes, cls.directories_checked, cls.blend_filepaths_checked = (
+                find_unused_takes(cls.catalogue)
+            )
+        except RuntimeError as err:
+            self.report({'ERROR'}, f"Could not find unused takes: {err}")
+            return {'CANCELLED'}
+
+        if not cls.unused_takes:
+            self.report({'INFO'}, "All takes are in use")
+            return {'CANCELLED'}
+        return context.window_manager.invoke_props_dialog(self, width=400)
+
+    def draw(self, context):
+        cls = SEQUENCER_OT_push_to_talk_clean_up
+        size = sum((cls.catalogue.get(name) or {}).get('size', 0) for name in cls.unused_takes)
+        col = self.layout.column()
+        col.label(
+            text=f"Delete {len(cls.unused_takes)} unused takes ({size / 1e6:.1f} MB)?",
+            icon='TRASH',
+        )
+        for filename in cls.unused_takes[:5]:
+            col.label(text=filename)
+        if len(cls.unused_takes) > 5:
+            col.label(text="...")
+        col.separator()
+        col.label(text=f"Checked {len(cls.blend_filepaths_checked)} blend files:")
+        for blend_filepath in cls.blend_filepaths_checked[:5]:
+            col.label(text=os.path.basename(blend_filepath) or blend_filepath, icon='BLENDER')
+        if len(cls.blend_filepaths_checked) > 5:
+            col.label(text="...")
+        col.separator()
+        col.label(text="Only the blend files in these directories were checked:", icon='INFO')
+        for directory in cls.directories_checked:
+            col.label(text=directory, icon='FILE_FOLDER')
+        col.label(text="Takes used by blend files elsewhere will be deleted too.")
+
+    def execute(self, context):
+        cls = SEQUENCER_OT_push_to_talk_clean_up
+        if not cls.catalogue:
+            return {'CANCELLED'}
+
+        removed, size = [], 0
+        for filename in cls.unused_takes:
+            filepath = os.path.join(cls.catalogue.directory, filename)
+            try:
+                size += os.path.getsize(filepath)
+                os.remove(filepath)
+                remove_peaks_file(filepath)
+            except FileNotFoundError:
+                pass  # Already deleted by hand.
+            except OSError as err:
+                log.warning(f"PushToTalk: could not delete '{filepath}': {err}")
+                continue
+            removed.append(filename)
+        cls.catalogue.remove(removed)
+
+        self.report({'INFO'}, f"Deleted {len(removed)} unused takes, {size / 1e6:.1f} MB")
+        cls.catalogue = None
+        cls.unused_takes = []
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_push_to_talk_reprocess(Operator):
+    bl_idname = "sequencer.push_to_talk_reprocess"
+    bl_label = "Reprocess Takes"
+    bl_description = (
+        "Relink, convert, trim or normalize the existing recordings, with the settings of the "
+        "panel. Files are processed in parallel and the strips updated at once when done"
+    )
+    bl_options = {'UNDO', 'REGISTER'}
+
+    scope: EnumProperty(
+        items=[
+            ('ALL', "All Scenes", "The recordings in all scenes of this blend file"),
+            ('SELECTED', "Selected", "The selected recordings"),
+        ],
+        name="Strips",
+        description="Which recordings to reprocess. They are told apart from other sound "
+        "strips by their name prefix, or by their file being in the take catalogue",
+        default='ALL',
+    )
+    relink: BoolProperty(
+        name="Relink Missing Files",
+        description="Point recordings whose file is missing, e.g. after the sounds directory "
+        "was moved, to the file of the same name in the sounds directory",
+        default=True,
+    )
+    convert: BoolProperty(
+        name="Convert to File Format",
+        description="Convert the sound files to the file format of the panel. The original "
+        "files are kept, for other blend files using them (see Clean Up Unused Takes)",
+        default=False,
+    )
+    trim: BoolProperty(
+        name="Trim Silence",
+        description="Trim the silence with the threshold and padding of the panel",
+        default=False,
+    )
+    normalize: BoolProperty(
+        name="Normalize Loudness",
+        description="Set the volume for the loudness target of the panel. Recordings without "
+        "a measured loudness are measured, which needs NumPy",
+        default=False,
+    )
+
+    # (files processed, files to process) of the running reprocessing, or None.
+    progress = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._strips = {}  # Sound file path: [(scene, strip)] using it.
+        self._executor = None
+        self._futures = {}  # Future: sound file path it processes.
+        self._timer = None
+        self._num_missing = 0
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.sequence_editor is not None and cls.progress is None
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=400)
+
+    def collect_strips(self, context, addon_prefs, sounds_dir_sys):
+        """Group the recordings to reprocess by sound file, relinking missing files."""
+
+        catalogue = get_take_catalogue(sounds_dir_sys) if os.path.isdir(sounds_dir_sys) else None
+        if self.scope == 'SELECTED':
+            scene_strips = [(context.scene, strip) for strip in context.selected_editable_sequences]
+        else:
+            scene_strips = [
+                (scene, strip)
+                for scene in bpy.data.scenes
+                if scene.sequence_editor
+                for strip in scene.sequence_editor.sequences_all
+            ]
+
+        for scene, strip in scene_strips:
+            if strip.type != 'SOUND' or not strip.sound or strip.sound.library:
+                continue
+            filepath = bpy.path.abspath(strip.sound.filepath)
+            filename = os.path.basename(filepath)
+            in_catalogue = catalogue is not None and catalogue.get(filename) is not None
+            if not strip.name.startswith(addon_prefs.prefix) and not in_catalogue:
+                continue
+            if not os.path.exists(filepath):
+                relinked_filepath = os.path.join(sounds_dir_sys, filename)
+                if not self.relink or not os.path.exists(relinked_filepath):
+                    self._num_missing += 1
+                    continue
+                filepath = relinked_filepath
+            self._strips.setdefault(filepath, []).append((scene, strip))
+
+    def execute(self, context):
+        addon_prefs = context.preferences.addons[ADDON_ID].preferences
+        sounds_dir_sys = bpy.path.abspath(addon_prefs.sounds_dir)
+        self.collect_strips(context, addon_prefs, sounds_dir_sys)
+        if not self._strips:
+            self.report({'WARNING'}, "No recordings to reprocess")
+            return {'CANCELLED'}
+
+        extension = ""
+        if self.convert:
+            if not ffmpeg_exe_path:
+                self.report({'ERROR'}, "Converting the sound files needs ffmpeg")
+                return {'CANCELLED'}
+            extension = FILE_FORMATS[addon_prefs.file_format]
+        trim_threshold = 10 ** (addon_prefs.trim_threshold / 20) if self.trim else None
+
+        # Only files that need converting or analyzing go to the workers.
+        jobs = []
+        for filepath, strips in self._strips.items():
+            measure = self.normalize and np is not None and any(
+                strip.get(LOUDNESS_PROPERTY) is None for _scene, strip in strips
+            )
+            if extension or trim_threshold is not None or measure:
+                jobs.append((filepath, measure))
+        if not jobs:
+            self.apply_results(context, {})
+            return {'FINISHED'}
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1, thread_name_prefix="push_to_talk_reprocess"
+        )
+        codec_args = get_codec_args(addon_prefs)
+        for filepath, measure in jobs:
+            future = self._executor.submit(
+                reprocess_sound_file, filepath, codec_args, extension, trim_threshold, measure
+            )
+            self._futures[future] = filepath
+
+        SEQUENCER_OT_push_to_talk_reprocess.progress = (0, len(jobs))
+        wm = context.window_manager
+        wm.progress_begin(0, len(jobs))
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.finish(context)
+            self.report({'WARNING'}, "Reprocessing cancelled, no strips were changed")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        num_done = sum(future.done() for future in self._futures)
+        if num_done != SEQUENCER_OT_push_to_talk_reprocess.progress[0]:
+            SEQUENCER_OT_push_to_talk_reprocess.progress = (num_done, len(self._futures))
+            context.window_manager.progress_update(num_done)
+            for window in context.window_manager.windows:
+                for area in window.screen.areas:
+                    if area.type == 'SEQUENCE_EDITOR':
+                        area.tag_redraw()
+        if num_done < len(self._futures):
+            return {'PASS_THROUGH'}
+
+        results = {}
+        try:
+            for future, filepath in self._futures.items():
+                try:
+                    results[filepath] = future.result()
+                except Exception as err:
+                    # Skip the file, its strips are left as they are.
+                    log.warning(f"PushToTalk: could not reprocess '{filepath}': {err!r}")
+        finally:
+            self.finish(context)
+        self.apply_results(context, results)
+        return {'FINISHED'}
+
+    def finish(self, context):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._timer:
+            context.window_manager.event_timer_remove(self._timer)
+            context.window_manager.progress_end()
+        SEQUENCER_OT_push_to_talk_reprocess.progress = None
+
+    def apply_results(self, context, results):
+        """Update all the strips at once. Each sound is relinked once, to reload it once."""
+
+        addon_prefs = context.preferences.addons[ADDON_ID].preferences
+        catalogue = get_take_catalogue(bpy.path.abspath(addon_prefs.sounds_dir))
+        relinked_sounds = {}  # Sound: its new file path.
+        processed_filepaths = set(self._futures.values())
+        num_strips = num_failed = 0
+        for filepath, strips in self._strips.items():
+            if filepath in processed_filepaths and filepath not in results:
+                num_failed += 1
+                continue
+            result = results.get(filepath, {})
+            new_filepath = result.get('filepath', filepath)
+            for scene, strip in strips:
+                if not strip.name:
+                    continue  # Deleted while the files were processed.
+                num_strips += 1
+                if bpy.path.abspath(strip.sound.filepath) != new_filepath:
+                    relinked_sounds[strip.sound] = new_filepath
+                if 'audible_range' in result:
+                    trim_sound_strip(
+                        scene, strip, result['audible_range'], addon_prefs.trim_padding
+                    )
+                if self.normalize:
+                    loudness, true_peak = result.get('loudness') or (
+                        strip.get(LOUDNESS_PROPERTY), strip.get(TRUE_PEAK_PROPERTY, 0.0)
+                    )
+                    set_strip_loudness(
+                        strip,
+                        loudness,
+                        true_peak,
+                        addon_prefs.loudness_target,
+                        addon_prefs.loudness_peak_limit,
+                    )
+
+            # List converted takes in the catalogue, like the originals.
+            take_info = catalogue.get(os.path.basename(filepath))
+            if new_filepath != filepath and take_info:
+                try:
+                    catalogue.add(dict(
+                        take_info,
+                        file=os.path.basename(new_filepath),
+                        size=os.path.getsize(new_filepath),
+                    ))
+                except OSError as err:
+                    log.warning(f"PushToTalk: could not add the take to the catalogue: {err}")
+
+        for sound, filepath in relinked_sounds.items():
+            sound.filepath = filepath
+
+        self.report(
+            {'WARNING'} if num_failed or self._num_missing else {'INFO'},
+            f"Reprocessed {num_strips} recordings, relinked {len(relinked_sounds)} sounds"
+            + (f", {num_failed} files failed" if num_failed else "")
+            + (f", {self._num_missing} files missing" if self._num_missing else ""),
+        )
+
+
+class SEQUENCER_OT_push_to_talk_add_take(Operator):
+    bl_idname = "sequencer.push_to_talk_add_take"
+    bl_label = "Add Take at Playhead"
+    bl_description = "Add a sound strip of this take at the playhead, on a free channel"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: StringProperty(name="File Path", subtype='FILE_PATH', options={'SKIP_SAVE'})
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene is not None
+
+    def execute(self, context):
+        if not os.path.isfile(self.filepath):
+            self.report({'ERROR'}, f"The take's sound file is missing: '{self.filepath}'")
+            return {'CANCELLED'}
+
+        scene = context.scene
+        if not scene.sequence_editor:
+            scene.sequence_editor_create()
+        sequences = scene.sequence_editor.sequences
+        name = os.path.splitext(os.path.basename(self.filepath))[0]
+        sound_strip = sequences.new_sound(name, self.filepath, 1, scene.frame_current)
+
+        # Move it up to the first channel where it doesn't overlap other strips.
+        occupied = {
+            strip.channel
+            for strip in sequences
+            if strip != sound_strip
+            and strip.frame_final_start < sound_strip.frame_final_end
+            and strip.frame_final_end > sound_strip.frame_final_start
+        }
+        channel = 1
+        while channel in occupied:
+            channel += 1
+        sound_strip.channel = channel
+        return {'FINISHED'}
 
 
 # UI ###############################################################################################
 
 
 def draw_push_to_talk_button(self, context):
+    # Drawn on every redraw of every sequencer header, including during playback.
+    call_measured("draw_header", _draw_push_to_talk_button, self.layout, context)
+
+
+def _draw_push_to_talk_button(layout, context):
     # Show only in the sequencer area (not on the preview area).
     if (
         context.space_data.view_type != 'SEQUENCER'
@@ -608,14 +4448,77 @@ def draw_push_to_talk_button(self, context):
     ):
         return
 
-    layout = self.layout
     if SEQUENCER_OT_push_to_talk.is_running:
         # 'SNAP_FACE' is used because it looks like 'STOP', which was removed.
         layout.operator("sequencer.push_to_talk", text="Stop Recording", icon='SNAP_FACE')
+        draw_input_level_meter(layout)
     else:
         layout.operator("sequencer.push_to_talk", text="Start Recording", icon='REC')
 
 
+def draw_input_level_meter(layout):
+    """Show the input level while recording, with warnings if the input is silent or lost."""
+
+    levels = SEQUENCER_OT_push_to_talk.input_levels
+    if levels is None:
+        return
+
+    # Audio was lost: let the actor know right away, to redo the take.
+    if SEQUENCER_OT_push_to_talk.capture_warning:
+        layout.label(text=SEQUENCER_OT_push_to_talk.capture_warning, icon='ERROR')
+
+    peak_db = level_to_db(levels[0])
+    silent_time = time.monotonic() - SEQUENCER_OT_push_to_talk.time_last_signal
+    if silent_time > 2.0:  # seconds
+        layout.label(text="No input signal, is the microphone muted?", icon='ERROR')
+        return
+
+    # Map -60..0 dBFS to the meter's range.
+    factor = min(max((peak_db + 60) / 60, 0.0), 1.0)
+    text = f"{peak_db:.0f} dB"
+    if hasattr(layout, "progress"):  # Blender 4.0+
+        row = layout.row()
+        row.ui_units_x = 5
+        row.progress(factor=factor, type='BAR', text=text)
+    else:
+        layout.label(text=text, icon='SOUND')
+
+
+def draw_take_telemetry(layout):
+    """Show measurements of the last take, and statistics of the recent ones."""
+
+    last_take = recent_telemetry[-1]
+    if last_take.get('capture') is not None:
+        rate = last_take.get('write_rate') or 0
+        layout.label(
+            text=f"Last Take: {last_take['capture']:.1f} s, {last_take['bytes'] / 1e6:.1f} MB, "
+            f"{rate / 1e3:.0f} kB/s",
+            icon='DISK_DRIVE',
+        )
+    if last_take.get('spawn') is not None:
+        layout.label(text=f"Last Take Process Start: {last_take['spawn'] * 1000:.0f} ms")
+    if any(code not in {0, None} for code in last_take.get('exit_codes', ())):
+        layout.label(text=f"Exit Codes: {last_take['exit_codes']}", icon='ERROR')
+    if last_take.get('overruns') or (last_take.get('missing_audio') or 0) > MISSING_AUDIO_TOLERANCE:
+        layout.label(
+            text=f"Last Take Dropouts: {last_take['overruns']} overruns, "
+            f"{last_take['missing_audio'] * 1000:.0f} ms missing",
+            icon='ERROR',
+        )
+
+    labels = (
+        ('first_sample', "Start Latency", 1000, "ms"),
+        ('finalize', "Finalize", 1000, "ms"),
+    )
+    for name, label, scale, unit in labels:
+        if name in telemetry_stats:
+            p50, p95 = telemetry_stats[name]
+            layout.label(
+                text=f"{label} p50/p95: {p50 * scale:.0f} / {p95 * scale:.0f} {unit} "
+                f"({len(recent_telemetry)} takes)"
+            )
+
+
 class SEQUENCER_PT_push_to_talk(Panel):
     bl_label = "Configuration"
     bl_category = "Push To Talk"
@@ -632,15 +4535,14 @@ class SEQUENCER_PT_push_to_talk(Panel):
         )
 
     def draw(self, context):
+        call_measured("draw_panel", self.draw_settings, context)
+
+    def draw_settings(self, context):
         layout = self.layout
         layout.use_property_split = True
         layout.use_property_decorate = False
 
-        problem_found = ""
-        if os_platform not in supported_platforms:
-            problem_found = f"Recording on {os_platform} is not supported"
-        elif os_platform in {'Linux', 'Windows'} and not ffmpeg_exe_path:
-            problem_found = "ffmpeg not found separately installed"
+        problem_found = get_recording_problems()[0]
 
         col = layout.column()
         if problem_found:
@@ -652,9 +4554,74 @@ class SEQUENCER_PT_push_to_talk(Panel):
 
         col.prop(addon_prefs, "prefix")
         col.prop(addon_prefs, "sounds_dir")
+        if os_platform in {'Linux', 'Windows'}:
+            col.prop(addon_prefs, "file_format")
+            if addon_prefs.file_format == 'FLAC':
+                col.prop(addon_prefs, "flac_compression")
+            elif addon_prefs.file_format == 'OPUS':
+                col.prop(addon_prefs, "opus_bitrate")
+            sub = col.column()
+            sub.active = addon_prefs.file_format == 'WAV'
+            sub.prop(addon_prefs, "live_sound_strip")
+            col.prop(addon_prefs, "capture_sample_rate")
+            col.prop(addon_prefs, "capture_channels")
+            col.prop(addon_prefs, "write_buffer_size")
+            col.prop(addon_prefs, "sync_interval")
 
         col.separator()
         col.prop(addon_prefs, "audio_input_device")
+        if os_platform in {'Linux', 'Windows'}:
+            col.prop(addon_prefs, "use_multiple_inputs")
+            if addon_prefs.use_multiple_inputs:
+                for nr in range(2, MAX_AUDIO_INPUTS + 1):
+                    col.prop(addon_prefs, f"audio_input_device_{nr}")
+            col.prop(addon_prefs, "keep_microphone_armed")
+            sub = col.column()
+            sub.active = addon_prefs.keep_microphone_armed
+            sub.prop(addon_prefs, "armed_idle_timeout")
+            sub.prop(addon_prefs, "pre_roll")
+
+        col.separator()
+        col.prop(addon_prefs, "trim_silence")
+        sub = col.column()
+        sub.active = addon_prefs.trim_silence
+        sub.prop(addon_prefs, "trim_threshold")
+        sub.prop(addon_prefs, "trim_padding")
+        if os_platform in {'Linux', 'Windows'}:
+            col.prop(addon_prefs, "correct_drift")
+
+        if np:
+            col.separator()
+            col.prop(addon_prefs, "normalize_loudness")
+            sub = col.column()
+            sub.active = addon_prefs.normalize_loudness
+            sub.prop(addon_prefs, "loudness_target")
+            sub.prop(addon_prefs, "loudness_peak_limit")
+            sub.operator("sequencer.push_to_talk_normalize", text="Normalize Selected")
+            if SEQUENCER_OT_push_to_talk.is_running and capture_session:
+                for meter in capture_session.loudness_meters:
+                    loudness = meter.integrated_loudness
+                    if loudness is not None:
+                        col.label(text=f"Take Loudness: {loudness:.1f} LUFS", icon='SOUND')
+
+        latency = SEQUENCER_OT_push_to_talk.last_take_latency
+        finalize_duration = SEQUENCER_OT_push_to_talk.last_take_finalize_duration
+        if latency is not None or finalize_duration is not None:
+            col.separator()
+        if latency is not None:
+            col.label(text=f"Last Take Start Latency: {latency * 1000:.0f} ms", icon='TIME')
+        if finalize_duration is not None:
+            col.label(
+                text=f"Last Take Finalize: {finalize_duration * 1000:.0f} ms", icon='FILE_TICK'
+            )
+        playback_speed = SEQUENCER_OT_push_to_talk.last_take_playback_speed
+        if playback_speed is not None:
+            col.label(
+                text=f"Last Take Playback Drift: {(playback_speed - 1) * 100:+.2f}%",
+                icon='PREVIEW_RANGE',
+            )
+        if recent_telemetry:
+            draw_take_telemetry(col)
         # DEBUG
         # col.prop(addon_prefs, "audio_device_linux", text="(linux Debug)")
         # col.prop(addon_prefs, "audio_device_darwin", text="(macOS Debug)")
@@ -670,6 +4637,50 @@ class SEQUENCER_PT_push_to_talk(Panel):
             )
 
 
+class SEQUENCER_PT_push_to_talk_takes(Panel):
+    bl_label = "Takes"
+    bl_category = "Push To Talk"
+    bl_space_type = 'SEQUENCE_EDITOR'
+    bl_region_type = 'UI'
+    bl_parent_id = "SEQUENCER_PT_push_to_talk"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    # Number of latest takes to list.
+    num_takes_shown = 10
+
+    def draw(self, context):
+        layout = self.layout
+        addon_prefs = context.preferences.addons[ADDON_ID].preferences
+        sounds_dir_sys = bpy.path.abspath(addon_prefs.sounds_dir)
+        if not os.path.isdir(sounds_dir_sys):
+            layout.label(text="No sounds directory yet")
+            return
+
+        # Listed from the catalogue, which doesn't need to scan the directory.
+        catalogue = get_take_catalogue(sounds_dir_sys)
+        col = layout.column(align=True)
+        col.label(
+            text=f"{len(catalogue.takes)} takes, {catalogue.total_size / 1e6:.1f} MB",
+            icon='FILE_SOUND',
+        )
+        for take in catalogue.recent(self.num_takes_shown):
+            filepath = os.path.join(sounds_dir_sys, take['file'])
+            row = col.row()
+            # Waveforms show up once loaded in the background, the icon takes the space till then.
+            row.template_icon(icon_value=waveform_cache.get_icon(filepath), scale=2.0)
+            row.label(text=take['file'])
+            row.label(text=f"{take.get('duration', 0.0):.1f}s")
+            row.operator(
+                "sequencer.push_to_talk_add_take", text="", icon='ADD'
+            ).filepath = filepath
+        progress = SEQUENCER_OT_push_to_talk_reprocess.progress
+        if progress:
+            layout.label(text=f"Reprocessing: {progress[0]} / {progress[1]} files", icon='SORTTIME')
+        else:
+            layout.operator("sequencer.push_to_talk_reprocess", icon='FILE_REFRESH')
+        layout.operator("sequencer.push_to_talk_clean_up", icon='TRASH')
+
+
 # Settings #########################################################################################
 
 
@@ -687,6 +4698,80 @@ class SEQUENCER_PushToTalk_Preferences(AddonPreferences):
         default="//",
         subtype="FILE_PATH",
     )
+    file_format: EnumProperty(
+        items=[
+            ('WAV', "WAV", "Uncompressed. Largest files, no encoding or decoding cost"),
+            ('FLAC', "FLAC", "Lossless compression. About half the size of WAV, cheap to encode"),
+            ('OPUS', "Opus", "Lossy compression in an Ogg file. Smallest files, "
+             "more costly to decode when scrubbing. Needs ffmpeg with libopus"),
+        ],
+        name="File Format",
+        description="Format of the sound files to save recordings in (WAV only on macOS)",
+        default='WAV',
+    )
+    flac_compression: IntProperty(
+        name="Compression",
+        description="FLAC compression level. Higher is smaller and slower to encode",
+        default=5,
+        min=0,
+        max=12,
+    )
+    opus_bitrate: IntProperty(
+        name="Bitrate (kb/s)",
+        description="Opus bitrate. 64 to 96 kb/s is transparent for most speech",
+        default=96,
+        min=6,
+        max=510,
+    )
+    write_buffer_size: IntProperty(
+        name="Write Buffer (KiB)",
+        description="Audio is written to disk in chunks of this size. Larger chunks are more "
+        "efficient, especially on network drives. 0 writes the audio as soon as it arrives",
+        default=WRITE_BUFFER_SIZE // 1024,
+        min=0,
+        soft_max=4096,
+    )
+    sync_interval: FloatProperty(
+        name="Sync Interval",
+        description="How often the recording is saved to disk regardless of the write buffer. "
+        "If Blender crashes, the take can be recovered up to then",
+        default=SYNC_INTERVAL,
+        min=0.1,
+        max=MAX_SYNC_INTERVAL,
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE',
+    )
+    live_sound_strip: BoolProperty(
+        name="Live Sound Strip",
+        description="While recording, show the take as a sound strip that grows as it's "
+        "written, to scrub back and listen to it while still rolling. WAV on Linux and Windows",
+        default=False,
+    )
+    capture_sample_rate: EnumProperty(
+        items=[
+            ('SCENE', "Scene", "The scene's audio mix rate, so takes play without resampling"),
+            ('44100', "44.1 kHz", "44100 Hz, as on CDs"),
+            ('48000', "48 kHz", "48000 Hz, as in most video"),
+            ('96000', "96 kHz", "96000 Hz, for high resolution audio"),
+        ],
+        name="Sample Rate",
+        description="Sample rate to record at, on Linux and Windows",
+        default='SCENE',
+        update=capture_format_update,
+    )
+    capture_channels: EnumProperty(
+        items=[
+            ('MONO', "Mono", "One channel per microphone, as most microphones are"),
+            ('STEREO', "Stereo", "Two channels per microphone, for stereo microphones. "
+             "Twice the size of mono"),
+            ('SCENE', "Scene", "The scene's audio channels: mono, or stereo for any other "
+             "layout"),
+        ],
+        name="Channels",
+        description="Channels to record per microphone, on Linux and Windows",
+        default='MONO',
+        update=capture_format_update,
+    )
     # Explicitly save an audio configuration per platform in case the same user uses Blender in
     # different platforms and syncs user settings.
     audio_device_linux: StringProperty(
@@ -712,13 +4797,118 @@ class SEQUENCER_PushToTalk_Preferences(AddonPreferences):
         options={'SKIP_SAVE'},
         update=save_sound_card_preference,
     )
+    use_multiple_inputs: BoolProperty(
+        name="Multiple Inputs",
+        description="Record several audio inputs at once, each into its own sound strip on "
+        "adjacent channels. For instance, to record a few people with a microphone each",
+        default=False,
+    )
+    # Additional audio inputs, only for the current session as devices come and go.
+    audio_input_device_2: EnumProperty(
+        items=populate_enum_items_for_extra_sound_devices,
+        name="Audio Input 2",
+        description="Another audio input device to record at the same time",
+        options={'SKIP_SAVE'},
+    )
+    audio_input_device_3: EnumProperty(
+        items=populate_enum_items_for_extra_sound_devices,
+        name="Audio Input 3",
+        description="Another audio input device to record at the same time",
+        options={'SKIP_SAVE'},
+    )
+    audio_input_device_4: EnumProperty(
+        items=populate_enum_items_for_extra_sound_devices,
+        name="Audio Input 4",
+        description="Another audio input device to record at the same time",
+        options={'SKIP_SAVE'},
+    )
+    keep_microphone_armed: BoolProperty(
+        name="Keep Microphone Armed",
+        description="Keep the audio device open between takes so recording starts without delay",
+        default=False,
+        update=keep_microphone_armed_update,
+    )
+    armed_idle_timeout: FloatProperty(
+        name="Release After",
+        description="Minutes without recording after which the armed audio device is released",
+        default=10.0,
+        min=0.5,
+        soft_max=120.0,
+    )
+    pre_roll: FloatProperty(
+        name="Pre-Roll",
+        description="Seconds of audio from before clicking record to add at the start of takes, "
+        "to not miss lines started a beat early. Kept in memory while the microphone is armed",
+        default=0.0,
+        min=0.0,
+        max=10.0,
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE',
+        update=pre_roll_update,
+    )
+    trim_silence: BoolProperty(
+        name="Trim Silence",
+        description="Hide the silence at the start and end of new sound strips. "
+        "The sound files are kept whole",
+        default=False,
+    )
+    trim_threshold: FloatProperty(
+        name="Threshold (dB)",
+        description="Level of the sound under which it is considered silence",
+        default=-45.0,
+        min=-90.0,
+        max=0.0,
+    )
+    trim_padding: FloatProperty(
+        name="Padding",
+        description="Seconds of silence to keep before and after the sound",
+        default=0.25,
+        min=0.0,
+        soft_max=2.0,
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE',
+    )
+    correct_drift: BoolProperty(
+        name="Correct Drift",
+        description="Adjust the speed of sound strips to the timeline's if playback drifted "
+        "from the audio while recording, slightly changing their pitch. "
+        "The position of takes is always corrected",
+        default=False,
+    )
+    normalize_loudness: BoolProperty(
+        name="Normalize Loudness",
+        description="Set the volume of new sound strips so they play at the target loudness. "
+        "The loudness is measured while recording. Needs NumPy",
+        default=False,
+    )
+    loudness_target: FloatProperty(
+        name="Target (LUFS)",
+        description="Integrated loudness to normalize sound strips to. "
+        "-23 LUFS is the EBU R128 broadcast level, around -16 LUFS is common online",
+        default=-23.0,
+        min=-70.0,
+        max=0.0,
+    )
+    loudness_peak_limit: FloatProperty(
+        name="Peak Limit (dBTP)",
+        description="Maximum true peak level. Quiet takes with loud peaks are normalized "
+        "to less than the target, so as not to clip",
+        default=-1.0,
+        min=-20.0,
+        max=0.0,
+    )
 
 
 # Add-on Registration ##############################################################################
 
 classes = (
     SEQUENCER_OT_push_to_talk,
+    SEQUENCER_OT_push_to_talk_normalize,
+    SEQUENCER_OT_push_to_talk_clean_up,
+    SEQUENCER_OT_push_to_talk_reprocess,
+    SEQUENCER_OT_push_to_talk_add_take,
     SEQUENCER_PT_push_to_talk,
+    SEQUENCER_PT_push_to_talk_takes,
     SEQUENCER_PushToTalk_Preferences,
 )
 
@@ -726,6 +4916,17 @@ classes = (
 def register():
     log.debug("--------Registering Push to Talk---------------------")
 
+    # Find the tools as they were in the previous session. They are checked again after startup.
+    global device_cache_path, telemetry_path
+    config_dir = get_user_config_dir()
+    device_cache_path = config_dir / "device_cache.json"
+    cache = load_device_cache()
+    locate_tools(cache)
+
+    # Measurements of the previous takes, for the statistics in the panel.
+    telemetry_path = config_dir / "take_telemetry.jsonl"
+    load_take_telemetry()
+
     # Log warnings and continue without raising errors.
     # This add-on should keep on functioning and gracefully disable the interface for recording.
     if os_platform not in supported_platforms:
@@ -753,44 +4954,17 @@ def register():
 
     bpy.types.SEQUENCER_HT_header.append(draw_push_to_talk_button)
 
-    bpy.app.timers.register(
-        SEQUENCER_OT_push_to_talk.update_on_main_thread, persistent=True
-    )  # Keep timer running across file loads
-
-    # Sync system detected audio devices with the saved preferences
+    # Repair recordings interrupted by a crash, now for absolute paths and on each file load.
+    bpy.app.handlers.load_post.append(recover_recordings_on_load)
     addon_prefs = bpy.context.preferences.addons[ADDON_ID].preferences
-    prop_rna = addon_prefs.rna_type.properties['audio_input_device']
-    audio_input_devices = {
-        'Linux': addon_prefs.audio_device_linux,
-        'Darwin': addon_prefs.audio_device_darwin,
-        'Windows': addon_prefs.audio_device_windows,
-    }
-    saved_setting_value = audio_input_devices[os_platform]
-    log.debug(f"Preferred device from user settings: \"{saved_setting_value}\"")
-
-    audio_devices_found = populate_enum_items_for_sound_devices(prop_rna, bpy.context)
-    assert audio_devices_found  # Should always have an option also when no device is found.
-
-    found_preferred_mic = False
-    for enum_item in audio_devices_found:
-        if enum_item[0] == saved_setting_value:
-            found_preferred_mic = True
-            break
+    recover_recordings_async(bpy.path.abspath(addon_prefs.sounds_dir))
 
-    if found_preferred_mic:
-        # Set the runtime setting to the user setting.
-        addon_prefs.audio_input_device = saved_setting_value
-    else:
-        # Log if the user setting got lost.
-        if saved_setting_value != "setting not synced yet":
-            log.info(
-                f"Could not restore audio device user preference: "
-                f"'{saved_setting_value}'. This can happen if the preferred audio device "
-                f"is not currently connected."
-            )
-        # Set the runtime setting to the first audio device.
-        # This will also update the user setting via the enum's update function.
-        addon_prefs.audio_input_device = str(audio_devices_found[0][0])
+    # Restore the devices found in the previous session and sync them with the saved preferences.
+    # Spawning processes to look for devices can take a while, so it is left for after startup.
+    if cache and cache.get('devices'):
+        device_watcher.restore([tuple(item) for item in cache['devices']], cache.get('signature'))
+        restore_preferred_audio_device()
+    bpy.app.timers.register(revalidate_audio_devices, first_interval=1.0)
 
     log.debug("--------Done Registering-----------------------------")
 
@@ -800,8 +4974,21 @@ def unregister():
 
     if bpy.app.timers.is_registered(SEQUENCER_OT_push_to_talk.update_on_main_thread):
         bpy.app.timers.unregister(SEQUENCER_OT_push_to_talk.update_on_main_thread)
+    if bpy.app.timers.is_registered(close_idle_capture_session):
+        bpy.app.timers.unregister(close_idle_capture_session)
+    if bpy.app.timers.is_registered(revalidate_audio_devices):
+        bpy.app.timers.unregister(revalidate_audio_devices)
+    close_capture_session()
+    for take in pending_takes:
+        take.finalized.wait(3)
+    close_event_loop()
+    waveform_cache.clear()
 
     bpy.types.SEQUENCER_HT_header.remove(draw_push_to_talk_button)
+    if recover_recordings_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(recover_recordings_on_load)
+
+    device_watcher.stop()
 
     for cls in classes:
         bpy.utils.unregister_class(cls)
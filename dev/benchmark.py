@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Benchmark the Push To Talk add-on's hot paths, headless, outside of Blender.
+
+Blender is replaced by a minimal stand-in (dev/bpy_stub.py) and the audio tools by fakes
+(dev/fake_bin) that print the canned outputs in dev/ and simulate a microphone. The kernel's
+ALSA listings are read from canned copies in dev/ too.
+Results are printed as JSON, to track regressions across releases, e.g.:
+
+    python3 dev/benchmark.py --output bench_output.txt
+
+Pass --real-ffmpeg to capture from ffmpeg's lavfi sine source instead of the simulation.
+"""
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+dev_dir = pathlib.Path(__file__).resolve().parent
+repo_dir = dev_dir.parent
+
+sys.path.insert(0, str(dev_dir))
+import bpy_stub  # noqa: E402
+
+
+TIMER_EVENT = types.SimpleNamespace(type='TIMER')
+
+
+def summarize(durations):
+    """Statistics of a list of durations in seconds, in milliseconds."""
+
+    if not durations:
+        return {'n': 0}
+    ordered = sorted(durations)
+    return {
+        'n': len(ordered),
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'median_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        'min_ms': ordered[0] * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def time_calls(function, iterations):
+    durations = []
+    for _ in range(iterations):
+        time_start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - time_start)
+    return durations
+
+
+def import_addon():
+    spec = importlib.util.spec_from_file_location(
+        "push_to_talk", repo_dir / "__init__.py", submodule_search_locations=[str(repo_dir)]
+    )
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules["push_to_talk"] = addon
+    spec.loader.exec_module(addon)
+    return addon
+
+
+def pump_until(condition, timeout, operator=None):
+    """Run timers and modal updates until the condition is met. Return whether it was."""
+
+    time_end = time.monotonic() + timeout
+    while time.monotonic() < time_end:
+        bpy_stub.pump()
+        if operator:
+            operator.modal(bpy_stub.context, TIMER_EVENT)
+        if condition():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def record_take(addon, duration):
+    """Record a take. Return (invoke, invoke to first sample, execute, stop to strip) times."""
+
+    context = bpy_stub.context
+    sequences = context.scene.sequence_editor.sequences
+    operator = addon.SEQUENCER_OT_push_to_talk()
+
+    time_start = time.perf_counter()
+    result = operator.invoke(context, TIMER_EVENT)
+    invoke_duration = time.perf_counter() - time_start
+    assert result == {'RUNNING_MODAL'}, result
+    take = operator.take
+
+    if not pump_until(lambda: take.capture_session.first_sample_time is not None, 5, operator):
+        raise RuntimeError("no audio was captured")
+    pump_until(lambda: False, duration, operator)
+
+    time_start = time.perf_counter()
+    operator.execute(context)
+    execute_duration = time.perf_counter() - time_start
+    if not pump_until(lambda: take not in addon.pending_takes, 10):
+        raise RuntimeError("the sound strip was not added")
+    stop_to_strip = time.perf_counter() - time_start
+
+    for strip in list(sequences):
+        sequences.remove(strip)
+
+    return invoke_duration, take.latency, execute_duration, stop_to_strip
+
+
+def use_canned_alsa_listings(addon):
+    """Point the add-on to copies of /proc/asound and /dev/snd of the machine of the fakes."""
+
+    addon.ALSA_CARDS_PATH = str(dev_dir / "linux_proc_asound_cards.txt")
+    addon.ALSA_PCM_PATH = str(dev_dir / "linux_proc_asound_pcm.txt")
+    devices_dir = pathlib.Path(tempfile.mkdtemp(prefix="ptt_bench_dev_snd_"))
+    for node in ("controlC0", "controlC1", "pcmC0D0c", "pcmC0D0p", "pcmC0D3p", "pcmC0D7p",
+                 "pcmC0D8p", "pcmC1D0c", "timer"):
+        (devices_dir / node).touch()
+    addon.ALSA_DEVICES_DIR = str(devices_dir)
+
+
+def draw_while_recording(addon, header, redraws):
+    """Time header redraws during a take, as happen during playback. Return the durations."""
+
+    context = bpy_stub.context
+    operator = addon.SEQUENCER_OT_push_to_talk()
+    operator.invoke(context, TIMER_EVENT)
+    take = operator.take
+    pump_until(lambda: take.capture_session.first_sample_time is not None, 5, operator)
+    operator.modal(context, TIMER_EVENT)  # Update the level meter, which the header shows.
+    durations = time_calls(lambda: addon.draw_push_to_talk_button(header, context), redraws)
+
+    sequences = context.scene.sequence_editor.sequences
+    operator.execute(context)
+    pump_until(lambda: not addon.pending_takes, 10)
+    for strip in list(sequences):
+        sequences.remove(strip)
+    return durations
+
+
+def run(args):
+    os.environ["PATH"] = str(dev_dir / "fake_bin") + os.pathsep + os.environ["PATH"]
+    os.environ["PTT_BENCH_OPEN_DELAY"] = str(args.open_delay)
+    if args.real_ffmpeg:
+        os.environ["PTT_BENCH_REAL_FFMPEG"] = args.real_ffmpeg
+
+    bpy_stub.install()
+    time_start = time.perf_counter()
+    addon = import_addon()
+    import_duration = time.perf_counter() - time_start
+
+    # Run as on Linux, which is what the fakes simulate.
+    addon.os_platform = 'Linux'
+    addon.locate_tools()
+    use_canned_alsa_listings(addon)
+
+    perf_measurements = {}
+    addon.perf_hooks.append(
+        lambda name, duration, **details: perf_measurements.setdefault(name, []).append(duration)
+    )
+
+    results = {'import': summarize([import_duration])}
+
+    # Device enumeration: reading the kernel's listings, or spawning the tools and parsing their
+    # output.
+    results['enumerate_devices_linux'] = summarize(
+        time_calls(addon.get_audio_devices_list_linux, args.iterations)
+    )
+    results['enumerate_devices_linux_arecord'] = summarize(
+        time_calls(addon.get_audio_devices_list_arecord, args.iterations)
+    )
+    addon.os_platform = 'Windows'
+    results['enumerate_devices_windows'] = summarize(
+        time_calls(addon.get_audio_devices_list_windows, args.iterations)
+    )
+    addon.os_platform = 'Linux'
+
+    # Registration, as on Blender startup. The first time, there are no devices cached yet.
+    results['register_first_launch'] = summarize(time_calls(addon.register, 1))
+    pump_until(lambda: not bpy_stub.app.timers.is_registered(addon.revalidate_audio_devices), 10)
+    results['revalidate_devices'] = summarize(time_calls(addon.device_watcher.scan_now, 1))
+    addon.unregister()
+
+    register_durations, unregister_durations = [], []
+    for _ in range(args.registrations):
+        register_durations += time_calls(addon.register, 1)
+        unregister_durations += time_calls(addon.unregister, 1)
+    results['register'] = summarize(register_durations)
+    results['unregister'] = summarize(unregister_durations)
+
+    addon.register()
+    addon_prefs = bpy_stub.preferences.addons["push_to_talk"].preferences
+    context = bpy_stub.context
+
+    # Redraws while idle.
+    header = types.SimpleNamespace(layout=bpy_stub.Layout())
+    panel = addon.SEQUENCER_PT_push_to_talk()
+    results['poll_idle'] = summarize(time_calls(
+        lambda: addon.SEQUENCER_OT_push_to_talk.poll(context), args.redraws
+    ))
+    results['draw_header_idle'] = summarize(time_calls(
+        lambda: addon.draw_push_to_talk_button(header, context), args.redraws
+    ))
+    results['draw_panel_idle'] = summarize(time_calls(
+        lambda: panel.draw(context), args.redraws
+    ))
+
+    # Takes, with the microphone opened for each take and kept armed.
+    for armed in (False, True):
+        addon_prefs.keep_microphone_armed = armed
+        mode = "armed" if armed else "cold"
+        take_times = [record_take(addon, args.take_duration) for _ in range(args.takes)]
+        invoke, latency, execute, stop_to_strip = zip(*take_times)
+        results[f'invoke_{mode}'] = summarize(invoke)
+        results[f'invoke_to_first_sample_{mode}'] = summarize(latency)
+        results[f'execute_{mode}'] = summarize(execute)
+        results[f'stop_to_strip_{mode}'] = summarize(stop_to_strip)
+    results['draw_header_recording'] = summarize(
+        draw_while_recording(addon, header, args.redraws)
+    )
+    # A take shown as a live sound strip, refreshed while recording.
+    addon_prefs.live_sound_strip = True
+    record_take(addon, max(args.take_duration, 2.5))
+    addon_prefs.live_sound_strip = False
+    addon_prefs.keep_microphone_armed = False
+
+    # Redraws of the list of takes, which were added to the catalogue, once the first redraw
+    # loaded their waveforms in the background.
+    takes_panel = addon.SEQUENCER_PT_push_to_talk_takes()
+    takes_panel.draw(context)
+    pump_until(lambda: not addon.waveform_cache.loading, 10)
+    results['draw_takes_panel'] = summarize(time_calls(
+        lambda: takes_panel.draw(context), args.redraws
+    ))
+    filepath = next(iter(addon.waveform_cache.entries))
+    results['waveform_peaks'] = summarize(time_calls(
+        lambda: addon.compute_waveform_peaks(filepath, addon.WAVEFORM_SIZE[0]), args.iterations
+    ))
+
+    for name, durations in perf_measurements.items():
+        results[f'perf_hook_{name}'] = summarize(durations)
+
+    addon.unregister()
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_dir, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+
+    return {
+        'addon_version': ".".join(str(nr) for nr in addon.bl_info['version']),
+        'commit': commit,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': addon.np is not None,
+        'capture': "ffmpeg lavfi" if args.real_ffmpeg else "simulated",
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20, help="device enumerations")
+    parser.add_argument("--registrations", type=int, default=5, help="register/unregister")
+    parser.add_argument("--redraws", type=int, default=2000, help="poll and draw calls")
+    parser.add_argument("--takes", type=int, default=5, help="takes per capture mode")
+    parser.add_argument("--take-duration", type=float, default=0.5, help="seconds per take")
+    parser.add_argument("--open-delay", type=float, default=0.05,
+                        help="simulated time to open the audio device, in seconds")
+    parser.add_argument("--real-ffmpeg", help="path to a real ffmpeg to capture a sine wave")
+    parser.add_argument("--output", help="file to write the JSON results to, instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,522 @@
+"""A minimal stand-in for Blender's bpy module, to run the add-on headless.
+
+Only what the Push To Talk add-on uses is implemented, with just enough behavior for
+dev/benchmark.py to exercise the add-on's hot paths on a plain Python install.
+Call install() before importing the add-on, and pump() to run timers and playback.
+"""
+
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import types
+
+
+# Properties #######################################################################################
+
+
+class Property:
+    """Records the arguments of a bpy.props definition."""
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        self.kwargs = kwargs
+
+    def default_value(self, owner):
+        if 'default' in self.kwargs:
+            return self.kwargs['default']
+        if self.kind == 'EnumProperty':
+            items = self.kwargs['items']
+            if callable(items):
+                items = items(owner, context)
+            return items[0][0] if items else ""
+        if self.kind == 'CollectionProperty':
+            return Collection(self.kwargs.get('type'))
+        return {'BoolProperty': False, 'IntProperty': 0, 'FloatProperty': 0.0}.get(self.kind, "")
+
+
+def _make_property(kind):
+    def define(**kwargs):
+        return Property(kind, **kwargs)
+    define.__name__ = kind
+    return define
+
+
+class Collection(list):
+    def __init__(self, item_type=None):
+        super().__init__()
+        self.item_type = item_type
+
+    def add(self):
+        item = self.item_type()
+        self.append(item)
+        return item
+
+    def clear(self):
+        del self[:]
+
+
+class PropertyOwner:
+    """Holds the values of the properties annotated on the class, and calls their updates."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        for name, prop in self._properties().items():
+            object.__setattr__(self, name, prop.default_value(self))
+
+    @classmethod
+    def _properties(cls):
+        properties = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).get('__annotations__', {}).items():
+                if isinstance(value, Property):
+                    properties[name] = value
+        return properties
+
+    def __getattribute__(self, name):
+        value = object.__getattribute__(self, name)
+        if name.startswith("_"):
+            return value
+        # Blender resolves the value of an enum with dynamic items by calling for the items.
+        prop = type(self)._properties().get(name)
+        if prop and prop.kind == 'EnumProperty' and callable(prop.kwargs['items']):
+            prop.kwargs['items'](self, context)
+        return value
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        prop = self._properties().get(name)
+        if prop and prop.kwargs.get('update'):
+            prop.kwargs['update'](self, context)
+
+
+# Types ############################################################################################
+
+
+class Operator(PropertyOwner):
+    def report(self, level, message):
+        print(f"[{', '.join(sorted(level))}] {message}", file=sys.stderr)
+
+    @classmethod
+    def poll_message_set(cls, message):
+        cls.poll_message = message
+
+
+class Panel:
+    def __init__(self):
+        self.layout = Layout()
+
+
+class AddonPreferences(PropertyOwner):
+    pass
+
+
+class PropertyGroup(PropertyOwner):
+    pass
+
+
+class UIList:
+    pass
+
+
+class Header:
+    draw_functions = []
+
+    @classmethod
+    def append(cls, draw_function):
+        cls.draw_functions.append(draw_function)
+
+    @classmethod
+    def remove(cls, draw_function):
+        cls.draw_functions.remove(draw_function)
+
+
+class SEQUENCER_HT_header(Header):
+    draw_functions = []
+
+
+class Layout:
+    """Accepts any drawing call, counting them."""
+
+    def __init__(self):
+        self.num_calls = 0
+
+    def __getattr__(self, name):
+        def draw_call(*args, **kwargs):
+            self.num_calls += 1
+            return self
+        return draw_call
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+
+
+# Sequencer ########################################################################################
+
+
+class Strip:
+    def __init__(self, name, type, channel, frame_start, frame_duration):
+        self.name = name
+        self.type = type
+        self.channel = channel
+        self.frame_start = frame_start
+        self.frame_duration = frame_duration
+        self.frame_offset_start = 0
+        self.frame_offset_end = 0
+        self.color = (0.0, 0.0, 0.0)
+        self.blend_alpha = 1.0
+        self.volume = 1.0
+        self._sound = None
+        self.custom_properties = {}
+
+    @property
+    def sound(self):
+        return self._sound
+
+    @sound.setter
+    def sound(self, sound):
+        # Count the strips using each sound, like Blender.
+        if self._sound:
+            self._sound.users -= 1
+        if sound:
+            sound.users += 1
+        self._sound = sound
+
+    def __getitem__(self, key):
+        return self.custom_properties[key]
+
+    def __setitem__(self, key, value):
+        self.custom_properties[key] = value
+
+    def get(self, key, default=None):
+        return self.custom_properties.get(key, default)
+
+    @property
+    def frame_final_start(self):
+        return self.frame_start + self.frame_offset_start
+
+    @property
+    def frame_final_duration(self):
+        return self.frame_duration - self.frame_offset_start - self.frame_offset_end
+
+    @property
+    def frame_final_end(self):
+        return self.frame_final_start + self.frame_final_duration
+
+    @frame_final_end.setter
+    def frame_final_end(self, frame):
+        if self.type == 'SOUND':
+            self.frame_offset_end = self.frame_start + self.frame_duration - frame
+        else:
+            self.frame_duration = max(frame - self.frame_start, 1)
+
+
+class Sound:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.library = None
+        self.users = 0
+
+
+class Sequences(list):
+    def __init__(self, scene):
+        super().__init__()
+        self.scene = scene
+
+    def _unique_name(self, name):
+        names = {strip.name for strip in self}
+        unique_name, nr = name, 0
+        while unique_name in names:
+            nr += 1
+            unique_name = f"{name}.{nr:03}"
+        return unique_name
+
+    def get(self, name, default=None):
+        return next((strip for strip in self if strip.name == name), default)
+
+    def new_effect(self, name, type, channel, frame_start, frame_end):
+        strip = Strip(self._unique_name(name), type, channel, frame_start, frame_end - frame_start)
+        self.append(strip)
+        return strip
+
+    def new_sound(self, name, filepath, channel, frame_start):
+        fps = self.scene.render.fps / self.scene.render.fps_base
+        duration = round(sound_duration(filepath) * fps)
+        strip = Strip(self._unique_name(name), 'SOUND', channel, frame_start, duration)
+        strip.sound = Sound(filepath)
+        data.sounds.append(strip.sound)
+        self.append(strip)
+        return strip
+
+    def remove(self, strip):
+        super().remove(strip)
+        strip.sound = None
+        strip.name = ""  # Mimic an invalidated reference.
+
+
+class SequenceEditor:
+    def __init__(self, scene):
+        self.sequences = Sequences(scene)
+        self.sequences_all = self.sequences
+
+
+def sound_duration(filepath):
+    """Duration of a WAV file in seconds, or of raw 48kHz stereo 16-bit PCM otherwise."""
+
+    with open(filepath, "rb") as f:
+        header = f.read(4096)
+    if header[:4] == b"RIFF":
+        channels = int.from_bytes(header[22:24], 'little')
+        sample_rate = int.from_bytes(header[24:28], 'little')
+        data_offset = header.index(b"data") + 8
+        data_size = os.path.getsize(filepath) - data_offset
+        return data_size / (sample_rate * channels * 2)
+    return os.path.getsize(filepath) / (48000 * 2 * 2)
+
+
+# Context & Runtime ################################################################################
+
+
+class Scene:
+    def __init__(self, name="Scene"):
+        self.name = name
+        self.frame_current = 1
+        self.frame_start = 1
+        self.frame_end = 100000
+        self.render = types.SimpleNamespace(
+            fps=24,
+            fps_base=1.0,
+            ffmpeg=types.SimpleNamespace(audio_mixrate=48000, audio_channels='STEREO'),
+        )
+        self.sequence_editor = SequenceEditor(self)
+
+
+class Screen:
+    def __init__(self):
+        self.is_animation_playing = False
+        self.areas = [types.SimpleNamespace(type='SEQUENCE_EDITOR', tag_redraw=lambda: None)]
+
+
+class WindowManager:
+    def __init__(self, screen):
+        self.windows = [types.SimpleNamespace(screen=screen)]
+        self.modal_handlers = []
+        self.event_timers = []
+
+    def event_timer_add(self, time_step, window=None):
+        timer = types.SimpleNamespace(time_step=time_step)
+        self.event_timers.append(timer)
+        return timer
+
+    def event_timer_remove(self, timer):
+        self.event_timers.remove(timer)
+
+    def modal_handler_add(self, operator):
+        self.modal_handlers.append(operator)
+
+    def progress_begin(self, min_value, max_value):
+        self.progress = min_value
+
+    def progress_update(self, value):
+        self.progress = value
+
+    def progress_end(self):
+        self.progress = None
+
+
+class IDCollection(dict):
+    """Data-blocks by name, iterating over the data-blocks as bpy.data collections do."""
+
+    def __iter__(self):
+        return iter(self.values())
+
+
+class AddonEntry:
+    def __init__(self):
+        self.preferences = None
+
+
+class Addons(dict):
+    def __missing__(self, key):
+        entry = AddonEntry()
+        self[key] = entry
+        return entry
+
+
+class Preferences:
+    def __init__(self):
+        self.addons = Addons()
+        self.use_preferences_save = True
+        self.is_dirty = False
+
+
+class Timers:
+    def __init__(self):
+        self.due = {}  # Function: time when it should run next.
+
+    def register(self, function, first_interval=0, persistent=False):
+        self.due[function] = time.monotonic() + first_interval
+
+    def unregister(self, function):
+        self.due.pop(function, None)
+
+    def is_registered(self, function):
+        return function in self.due
+
+    def run_due(self):
+        now = time.monotonic()
+        for function, due_time in list(self.due.items()):
+            if due_time <= now and function in self.due:
+                interval = function()
+                if interval is None:
+                    self.due.pop(function, None)
+                else:
+                    self.due[function] = now + interval
+
+
+blend_dir = pathlib.Path(tempfile.mkdtemp(prefix="ptt_bench_blend_"))
+config_dir = pathlib.Path(tempfile.mkdtemp(prefix="ptt_bench_config_"))
+
+scene = Scene()
+screen = Screen()
+preferences = Preferences()
+context = types.SimpleNamespace(
+    scene=scene,
+    screen=screen,
+    preferences=preferences,
+    window_manager=WindowManager(screen),
+    window=None,
+    space_data=types.SimpleNamespace(type='SEQUENCE_EDITOR', view_type='SEQUENCER'),
+    selected_editable_sequences=[],
+)
+data = types.SimpleNamespace(
+    scenes=IDCollection({scene.name: scene}),
+    sounds=[],
+    libraries=[],
+    filepath=str(blend_dir / "edit.blend"),
+)
+app = types.SimpleNamespace(
+    timers=Timers(),
+    handlers=types.SimpleNamespace(load_post=[], persistent=lambda function: function),
+)
+
+_playback_last_time = None
+
+
+def animation_play():
+    global _playback_last_time
+    screen.is_animation_playing = not screen.is_animation_playing
+    _playback_last_time = time.monotonic()
+
+
+def pump():
+    """Advance playback with the wall clock and run the timers that are due."""
+
+    global _playback_last_time
+
+    now = time.monotonic()
+    if screen.is_animation_playing and _playback_last_time is not None:
+        fps = scene.render.fps / scene.render.fps_base
+        scene._frame_exact = getattr(scene, '_frame_exact', scene.frame_current)
+        scene._frame_exact += (now - _playback_last_time) * fps
+        scene.frame_current = int(scene._frame_exact)
+    elif hasattr(scene, '_frame_exact'):
+        del scene._frame_exact
+    _playback_last_time = now
+
+    app.timers.run_due()
+
+
+def abspath(path, library=None):
+    if path.startswith("//"):
+        return str(blend_dir) + os.sep + path[2:]
+    return path
+
+
+class PixelArray(list):
+    def foreach_set(self, values):
+        self[:] = list(values)
+
+
+class ImagePreview:
+    _next_icon_id = 1
+
+    def __init__(self):
+        self.icon_id = ImagePreview._next_icon_id
+        ImagePreview._next_icon_id += 1
+        self.icon_size = self.image_size = (0, 0)
+        self.icon_pixels_float = PixelArray()
+        self.image_pixels_float = PixelArray()
+
+
+class ImagePreviewCollection(dict):
+    def new(self, name):
+        if name in self:
+            raise KeyError(f"key {name!r} already exists")
+        preview = self[name] = ImagePreview()
+        return preview
+
+
+def previews_new():
+    return ImagePreviewCollection()
+
+
+def previews_remove(collection):
+    collection.clear()
+
+
+def register_class(cls):
+    if issubclass(cls, AddonPreferences):
+        preferences.addons[cls.bl_idname].preferences = cls()
+
+
+def unregister_class(cls):
+    pass
+
+
+def user_resource(resource_type, path="", create=False):
+    directory = config_dir / path
+    if create:
+        directory.mkdir(parents=True, exist_ok=True)
+    return str(directory)
+
+
+def install():
+    """Make 'import bpy' give this stand-in."""
+
+    bpy = types.ModuleType("bpy")
+    props = types.ModuleType("bpy.props")
+    for kind in (
+        'BoolProperty', 'CollectionProperty', 'EnumProperty', 'FloatProperty', 'IntProperty',
+        'PointerProperty', 'StringProperty',
+    ):
+        setattr(props, kind, _make_property(kind))
+
+    bpy_types = types.ModuleType("bpy.types")
+    for cls in (AddonPreferences, Header, Operator, Panel, PropertyGroup, UIList):
+        setattr(bpy_types, cls.__name__, cls)
+    bpy_types.SEQUENCER_HT_header = SEQUENCER_HT_header
+
+    bpy.props = props
+    bpy.types = bpy_types
+    bpy.app = app
+    bpy.context = context
+    bpy.data = data
+    bpy.ops = types.SimpleNamespace(screen=types.SimpleNamespace(animation_play=animation_play))
+    bpy.path = types.SimpleNamespace(abspath=abspath)
+    utils = types.ModuleType("bpy.utils")
+    utils.register_class = register_class
+    utils.unregister_class = unregister_class
+    utils.user_resource = user_resource
+    utils.previews = types.ModuleType("bpy.utils.previews")
+    utils.previews.new = previews_new
+    utils.previews.remove = previews_remove
+    bpy.utils = utils
+
+    sys.modules['bpy'] = bpy
+    sys.modules['bpy.props'] = props
+    sys.modules['bpy.types'] = bpy_types
+    sys.modules['bpy.utils'] = utils
+    sys.modules['bpy.utils.previews'] = utils.previews
+    return bpy